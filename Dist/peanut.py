@@ -6,17 +6,35 @@ import string
 import os
 import time
 import base64
-from math import floor
+import sys
+import functools
+from collections import namedtuple
 
-DIGITS = '0123456789'
 LETTERS = string.ascii_letters
-LETTERS_DIGITS = LETTERS + DIGITS
+
+# One alternative per kind of token, strings and anything unmatched are lexed by hand
+TOKEN_PATTERN = re.compile(r'''
+    (?P<WHITESPACE>[ \t]+)
+  | (?P<IDENTIFIER>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<OPERATOR>==|=>|!=|<=|>=|[-+*/^%()\[\]{},:?=<>])
+  | (?P<NUMBER>[0-9]+(?P<FRACTION>\.[0-9]*)?)
+  | (?P<NEWLINE>[;\n])
+  | (?P<COMMENT>\#[^\n]*\n?)
+''', re.VERBOSE)
+
+# Characters that end a plain run of string literal content
+STRING_SPECIAL_CHARS = re.compile(r'["\\$]')
+ESCAPE_CHARACTERS = {
+    'n': '\n',
+    't': '\t',
+    '$': '$'
+}
 
 FILE_NAME = 'CONSOLE'
 
 
 def string_with_arrows(text, pos_start, pos_end):
-    result = ''
+    result = []
 
     # Calculate indices
     idx_start = max(text.rfind('\n', 0, pos_start.idx), 0)
@@ -32,19 +50,31 @@ def string_with_arrows(text, pos_start, pos_end):
         col_end = pos_end.col if i == line_count - 1 else len(line) - 1
 
         # Append to result
-        result += line + '\n'
-        result += ' ' * col_start + '^' * (col_end - col_start)
+        result.append(line + '\n')
+        result.append(' ' * col_start + '^' * (col_end - col_start))
 
         # Re-calculate indices
         idx_start = idx_end
         idx_end = text.find('\n', idx_start + 1)
         if idx_end < 0: idx_end = len(text)
 
-    return result.replace('\t', '')
+    return ''.join(result).replace('\t', '')
 
 
 def containsAny(text, chars):
-    return 1 in [c in text for c in chars]
+    return not set(text).isdisjoint(chars)
+
+
+def generate_traceback(pos, ctx):
+    result = []
+
+    # Walks from the innermost context outwards, so the lines are reversed at the end
+    while ctx:
+        result.append(f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n')
+        pos = ctx.parent_entry_pos
+        ctx = ctx.parent
+
+    return 'Trace:\n' + ''.join(reversed(result))
 
 
 # endregion
@@ -104,16 +134,7 @@ class RTError(Error):
         return result
 
     def generate_traceback(self):
-        result = ''
-        pos = self.pos_start
-        ctx = self.context
-
-        while ctx:
-            result = f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n' + result
-            pos = ctx.parent_entry_pos
-            ctx = ctx.parent
-
-        return 'Trace:\n' + result
+        return generate_traceback(self.pos_start, self.context)
 
 
 class RTWarning(Warning):
@@ -126,374 +147,356 @@ class RTWarning(Warning):
         return result
 
     def generate_traceback(self):
-        result = ''
-        pos = self.pos_start
-        ctx = self.context
-
-        while ctx:
-            result = f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n' + result
-            pos = ctx.parent_entry_pos
-            ctx = ctx.parent
-
-        return 'Trace:\n' + result
+        return generate_traceback(self.pos_start, self.context)
 
 
 # endregion
 
 
-class Position:
-    def __init__(self, idx, ln, col, fn, ftxt):
-        self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.fn = fn
-        self.ftxt = ftxt
+# Positions are immutable, so tokens and nodes can share them freely instead of copying
+class Position(namedtuple('Position', ('idx', 'ln', 'col', 'fn', 'ftxt'))):
+    __slots__ = ()
 
     def advance(self, current_char=None):
-        self.idx += 1
-        self.col += 1
-
         if current_char == '\n':
-            self.ln += 1
-            self.col = 0
+            return Position(self.idx + 1, self.ln + 1, 0, self.fn, self.ftxt)
 
-        return self
+        return Position(self.idx + 1, self.ln, self.col + 1, self.fn, self.ftxt)
 
-    def copy(self):
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
+    def bulk_advance(self, amount):
+        # Only valid when the skipped characters contain no newline
+        return Position(self.idx + amount, self.ln, self.col + amount, self.fn, self.ftxt)
 
 
 # region Tokens and Keywords
-TT_INT = 'INT'
-TT_FLOAT = 'FLOAT'
-TT_STRING = 'STRING'
-TT_IDENTIFIER = 'IDENTIFIER'
-TT_KEYWORD = 'KEYWORD'
-TT_PLUS = 'PLUS'
-TT_MINUS = 'MINUS'
-TT_MUL = 'MUL'
-TT_DIV = 'DIV'
-TT_POW = 'POW'
-TT_MOD = 'MOD'
-TT_EQ = 'EQ'
-TT_LPAREN = 'LPAREN'
-TT_RPAREN = 'RPAREN'
-TT_LSQUARE = 'LSQUARE'
-TT_RSQUARE = 'RSQUARE'
-TT_LCURLY = 'LCURLY'
-TT_RCURLY = 'RCURLY'
-TT_EE = 'EE'
-TT_NE = 'NE'
-TT_LT = 'LT'
-TT_GT = 'GT'
-TT_LTE = 'LTE'
-TT_GTE = 'GTE'
-TT_COMMA = 'COMMA'
-TT_COLON = 'COLON'
-TT_ARROW = 'ARROW'
-TT_QUESTION = 'QUESTION'
-TT_NEWLINE = 'NEWLINE'
-TT_EOF = 'EOF'
-
-KEYWORDS = [
-    'var',
-    'let',
-    'scoped',
-    'strict',
-    'and',
-    'or',
-    'not',
-    'if',
-    'then',
-    'elif',
-    'else',
-    'for',
-    'until',
-    'step',
-    'while',
-    'function',
-    'end',
-    'return',
-    'continue',
-    'break'
-]
-
-TYPES = [
+# Token types are small ints, so the parser can test several at once with a bit mask
+TT_INT = 0
+TT_FLOAT = 1
+TT_STRING = 2
+TT_IDENTIFIER = 3
+TT_KEYWORD = 4
+TT_PLUS = 5
+TT_MINUS = 6
+TT_MUL = 7
+TT_DIV = 8
+TT_POW = 9
+TT_MOD = 10
+TT_EQ = 11
+TT_LPAREN = 12
+TT_RPAREN = 13
+TT_LSQUARE = 14
+TT_RSQUARE = 15
+TT_LCURLY = 16
+TT_RCURLY = 17
+TT_EE = 18
+TT_NE = 19
+TT_LT = 20
+TT_GT = 21
+TT_LTE = 22
+TT_GTE = 23
+TT_COMMA = 24
+TT_COLON = 25
+TT_ARROW = 26
+TT_QUESTION = 27
+TT_NEWLINE = 28
+TT_EOF = 29
+# Each keyword gets its own type, so the parser never has to compare keyword names
+TT_VAR = 30
+TT_LET = 31
+TT_SCOPED = 32
+TT_STRICT = 33
+TT_AND = 34
+TT_OR = 35
+TT_NOT = 36
+TT_IF = 37
+TT_THEN = 38
+TT_ELIF = 39
+TT_ELSE = 40
+TT_FOR = 41
+TT_UNTIL = 42
+TT_STEP = 43
+TT_WHILE = 44
+TT_FUNCTION = 45
+TT_END = 46
+TT_RETURN = 47
+TT_CONTINUE = 48
+TT_BREAK = 49
+
+KEYWORD_TOKEN_TYPES = {
+    'var': TT_VAR,
+    'let': TT_LET,
+    'scoped': TT_SCOPED,
+    'strict': TT_STRICT,
+    'and': TT_AND,
+    'or': TT_OR,
+    'not': TT_NOT,
+    'if': TT_IF,
+    'then': TT_THEN,
+    'elif': TT_ELIF,
+    'else': TT_ELSE,
+    'for': TT_FOR,
+    'until': TT_UNTIL,
+    'step': TT_STEP,
+    'while': TT_WHILE,
+    'function': TT_FUNCTION,
+    'end': TT_END,
+    'return': TT_RETURN,
+    'continue': TT_CONTINUE,
+    'break': TT_BREAK
+}
+
+# Names used when printing tokens, keywords still print as KEYWORD
+TOKEN_TYPE_NAMES = {value: name[3:] for name, value in list(globals().items()) if name.startswith('TT_')}
+for tok_type in KEYWORD_TOKEN_TYPES.values():
+    TOKEN_TYPE_NAMES[tok_type] = 'KEYWORD'
+
+KEYWORDS = frozenset(KEYWORD_TOKEN_TYPES)
+
+# Keywords grouped by first character, so most identifiers are ruled out without hashing the whole name.
+# Each group maps a keyword to its token type and the string keyword tokens carry as their value
+KEYWORDS_BY_FIRST_CHAR = {}
+for keyword in sorted(KEYWORDS):
+    KEYWORDS_BY_FIRST_CHAR.setdefault(keyword[0], {})[keyword] = (KEYWORD_TOKEN_TYPES[keyword], keyword)
+
+# Bit masks of the operator token types handled by each BinaryOp level
+POWER_OPS = 1 << TT_POW
+TERM_OPS = 1 << TT_MUL | 1 << TT_DIV | 1 << TT_MOD
+ARITH_OPS = 1 << TT_PLUS | 1 << TT_MINUS
+COMP_OPS = 1 << TT_EE | 1 << TT_NE | 1 << TT_LT | 1 << TT_GT | 1 << TT_LTE | 1 << TT_GTE
+LOGIC_OPS = 1 << TT_AND | 1 << TT_OR
+
+# Token types that statement() can start from, anything else fails before consuming a token
+STATEMENT_STARTERS = 0
+for tok_type in (
+        TT_RETURN, TT_CONTINUE, TT_BREAK, TT_VAR, TT_LET, TT_SCOPED, TT_STRICT, TT_NOT, TT_PLUS, TT_MINUS,
+        TT_INT, TT_FLOAT, TT_STRING, TT_IDENTIFIER, TT_LPAREN, TT_LSQUARE, TT_IF, TT_FOR, TT_WHILE, TT_FUNCTION
+):
+    STATEMENT_STARTERS |= 1 << tok_type
+
+TYPES = frozenset([
     'string',
     'int',
     'float'
-]
+])
+
+# Token types for everything matched by the OPERATOR pattern
+OPERATOR_TOKENS = {
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_MUL,
+    '/': TT_DIV,
+    '^': TT_POW,
+    '%': TT_MOD,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '[': TT_LSQUARE,
+    ']': TT_RSQUARE,
+    '{': TT_LCURLY,
+    '}': TT_RCURLY,
+    ',': TT_COMMA,
+    ':': TT_COLON,
+    '?': TT_QUESTION,
+    '=': TT_EQ,
+    '==': TT_EE,
+    '=>': TT_ARROW,
+    '!=': TT_NE,
+    '<': TT_LT,
+    '<=': TT_LTE,
+    '>': TT_GT,
+    '>=': TT_GTE
+}
 
 
 # endregion
 
 
 class Token:
+    __slots__ = ('type', 'value', 'pos_start', 'pos_end')
+
     def __init__(self, type_, value=None, pos_start=None, pos_end=None):
         self.type = type_
         self.value = value
 
         if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+            self.pos_start = pos_start
+            self.pos_end = pos_start.advance()
 
         if pos_end:
             self.pos_end = pos_end
 
-    def matches(self, type_, value):
-        return self.type == type_ and self.value == value
-
     def __repr__(self):
-        if self.value: return f'{self.type}:{self.value}'
-        return f'{self.type}'
+        if self.value: return f'{TOKEN_TYPE_NAMES[self.type]}:{self.value}'
+        return f'{TOKEN_TYPE_NAMES[self.type]}'
 
 
 class Lexer:
     def __init__(self, fn, text):
         self.fn = fn
         self.text = text
+        self.text_len = len(text)
         self.pos = Position(-1, 0, -1, fn, text)
         self.current_char = None
-        self.previous_char = None
         self.advance()
 
     def advance(self):
-        self.previous_char = self.current_char
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+        self.pos = pos = self.pos.advance(self.current_char)
+        idx = pos.idx
+        self.current_char = self.text[idx] if idx < self.text_len else None
+
+    def advance_to(self, idx):
+        # Jumps straight to idx, as if advance() had been called once per character in between
+        pos = self.pos
+        last_newline = self.text.rfind('\n', pos.idx, idx)
+        if last_newline < 0:
+            self.pos = pos.bulk_advance(idx - pos.idx)
+        else:
+            ln = pos.ln + self.text.count('\n', pos.idx, idx)
+            self.pos = Position(idx, ln, idx - last_newline - 1, pos.fn, pos.ftxt)
+
+        self.current_char = self.text[idx] if idx < self.text_len else None
 
     def make_tokens(self):
         tokens = []
+        # Bound once here, the loop body runs for every token and every skipped space
+        append_token = tokens.append
+        match_token = TOKEN_PATTERN.match
+        text = self.text
+        text_len = self.text_len
 
         while self.current_char is not None:
-            if self.current_char in ' \t':
-                self.advance()
-            elif self.current_char in ';\n':
-                tokens.append(Token(TT_NEWLINE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '#':
-                self.skip_comment()
-            elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
-            elif self.current_char in LETTERS:
-                tokens.append(self.make_identifier())
-            elif self.current_char == '"':
-                tokens.append(self.make_string())
-            elif self.current_char == '+':
-                tokens.append(Token(TT_PLUS, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '-':
-                tokens.append(Token(TT_MINUS, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '*':
-                tokens.append(Token(TT_MUL, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '/':
-                tokens.append(Token(TT_DIV, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '^':
-                tokens.append(Token(TT_POW, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '%':
-                tokens.append(Token(TT_MOD, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '(':
-                tokens.append(Token(TT_LPAREN, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ')':
-                tokens.append(Token(TT_RPAREN, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '[':
-                tokens.append(Token(TT_LSQUARE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ']':
-                tokens.append(Token(TT_RSQUARE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '{':
-                tokens.append(Token(TT_LCURLY, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '}':
-                tokens.append(Token(TT_RCURLY, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '!':
-                tok, error = self.make_not_equals()
-                if error: return [], error
-                tokens.append(tok)
-            elif self.current_char == '=':
-                tokens.append(self.make_equals())
-            elif self.current_char == '<':
-                tokens.append(self.make_less_than())
-            elif self.current_char == '>':
-                tokens.append(self.make_greater_than())
-            elif self.current_char == ',':
-                tokens.append(Token(TT_COMMA, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ':':
-                tokens.append(Token(TT_COLON, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == '?':
-                tokens.append(Token(TT_QUESTION, pos_start=self.pos))
-                self.advance()
-            else:
-                pos_start = self.pos.copy()
+            pos_start = self.pos
+            match = match_token(text, pos_start.idx)
+
+            if match is None:
                 char = self.current_char
+                if char == '"':
+                    append_token(self.make_string())
+                    continue
+                if char == '!':
+                    tok, error = self.make_not_equals()
+                    if error: return [], error
+                    append_token(tok)
+                    continue
+
                 self.advance()
                 return [], IllegalCharError(pos_start, self.pos, "'" + char + "'")
 
-        tokens.append(Token(TT_EOF, pos_start=self.pos))
-        return tokens, None
-
-    def make_number(self):
-        num_str = ''
-        dot_count = 0
-        pos_start = self.pos.copy()
+            kind = match.lastgroup
+            end = match.end()
 
-        while self.current_char != None and self.current_char in DIGITS + '.':
-            if self.current_char == '.':
-                if dot_count == 1: break
-                dot_count += 1
-                num_str += '.'
-            else:
-                num_str += self.current_char
-            self.advance()
+            if kind == 'NEWLINE':
+                append_token(Token(TT_NEWLINE, pos_start=pos_start))
+                self.advance()
+                continue
+            if kind == 'COMMENT':
+                # The comment runs to the end of the line, and its newline is consumed with it
+                self.advance_to(end)
+                continue
 
-        if dot_count == 0:
-            return Token(TT_INT, int(num_str), pos_start, self.pos)
-        else:
-            return Token(TT_FLOAT, float(num_str), pos_start, self.pos)
+            # Every other token sits on a single line
+            self.pos = pos_end = pos_start.bulk_advance(end - pos_start.idx)
+            self.current_char = text[end] if end < text_len else None
 
-    def make_string(self):
-        string = ''
-        pos_start = self.pos.copy()
-        escape_character = False
-        code = ''
-        code_result = None
-        self.advance()
+            if kind == 'WHITESPACE':
+                continue
 
-        if self.current_char == '$' and self.previous_char != '\\':
-            self.advance()
-            if self.current_char == '{':
-                self.advance()
-                while self.current_char != '}':
-                    new_code = code + self.current_char
-                    code = new_code
-                    self.advance()
-                self.advance()
-                code_result = run_interpolation('INTERPOLATION', code)
-                string += str(code_result)
-
-        escape_characters = {
-            'n': '\n',
-            't': '\t',
-            '$': '\$'
-        }
-
-        while self.current_char != None and (self.current_char != '"' or escape_character):
-            if escape_character:
-                string += escape_characters.get(self.current_char, self.current_char)
-            else:
-                if self.current_char == '\\':
-                    escape_character = True
+            value = match.group()
+            if kind == 'IDENTIFIER':
+                keywords = KEYWORDS_BY_FIRST_CHAR.get(value[0])
+                if keywords and value in keywords:
+                    tok_type, keyword = keywords[value]
+                    append_token(Token(tok_type, keyword, pos_start, pos_end))
                 else:
-                    string += self.current_char
-            self.advance()
-            escape_character = False
+                    # Interned so symbol table lookups for the same name compare by identity
+                    append_token(Token(TT_IDENTIFIER, sys.intern(value), pos_start, pos_end))
+            elif kind == 'OPERATOR':
+                append_token(Token(OPERATOR_TOKENS[value], None, pos_start, pos_end))
+            elif match.group('FRACTION') is None:
+                append_token(Token(TT_INT, int(value), pos_start, pos_end))
+            else:
+                append_token(Token(TT_FLOAT, float(value), pos_start, pos_end))
 
-            if self.current_char == '$' and self.previous_char != '\\':
-                self.advance()
-                if self.current_char == '{':
-                    self.advance()
-                    while self.current_char != '}':
-                        new_code = code + self.current_char
-                        code = new_code
-                        self.advance()
-                    self.advance()
-                    code_result = run_interpolation('INTERPOLATION', code)
-                    string += str(code_result)
+        tokens.append(Token(TT_EOF, pos_start=self.pos))
+        return tokens, None
 
+    def make_string(self):
+        parts = []
+        pos_start = self.pos
+        text = self.text
         self.advance()
-        return Token(TT_STRING, string, pos_start, self.pos)
-
-    def make_identifier(self):
-        id_str = ''
-        pos_start = self.pos.copy()
 
-        while self.current_char is not None and self.current_char in LETTERS_DIGITS + '_':
-            id_str += self.current_char
-            self.advance()
+        while True:
+            # Everything up to the next quote, backslash or '$' is plain string content
+            special = STRING_SPECIAL_CHARS.search(text, self.pos.idx)
+            end = special.start() if special else self.text_len
+            parts.append(text[self.pos.idx:end])
+            self.advance_to(end)
 
-        tok_type = TT_KEYWORD if id_str in KEYWORDS else TT_IDENTIFIER
-        return Token(tok_type, id_str, pos_start, self.pos)
+            if self.current_char is None or self.current_char == '"':
+                break
 
-    def make_not_equals(self):
-        pos_start = self.pos.copy()
-        self.advance()
+            if self.current_char == '\\':
+                self.advance()
+                if self.current_char is None: break
+                parts.append(ESCAPE_CHARACTERS.get(self.current_char, self.current_char))
+                self.advance()
+                continue
 
-        if self.current_char == '=':
             self.advance()
-            return Token(TT_NE, pos_start=pos_start, pos_end=self.pos), None
+            if self.current_char != '{':
+                parts.append('$')
+                continue
 
-        self.advance()
-        return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
+            parts.append(self.read_interpolation())
 
-    def make_equals(self):
-        tok_type = TT_EQ
-        pos_start = self.pos.copy()
         self.advance()
+        return Token(TT_STRING, ''.join(parts), pos_start, self.pos)
 
-        # ==
-        if self.current_char == '=':
-            self.advance()
-            tok_type = TT_EE
-        # =>
-        elif self.current_char == '>':
-            self.advance()
-            tok_type = TT_ARROW
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_less_than(self):
-        tok_type = TT_LT
-        pos_start = self.pos.copy()
+    def read_interpolation(self):
+        # Runs the code between '${' and '}' and returns its result as text
         self.advance()
-
-        if self.current_char == '=':
+        code_parts = []
+        while self.current_char is not None and self.current_char != '}':
+            code_parts.append(self.current_char)
             self.advance()
-            tok_type = TT_LTE
+        self.advance()
 
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+        code_result = run_interpolation('INTERPOLATION', ''.join(code_parts))
+        return str(code_result)
 
-    def make_greater_than(self):
-        tok_type = TT_GT
-        pos_start = self.pos.copy()
+    def make_not_equals(self):
+        pos_start = self.pos
         self.advance()
 
         if self.current_char == '=':
             self.advance()
-            tok_type = TT_GTE
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+            return Token(TT_NE, pos_start=pos_start, pos_end=self.pos), None
 
-    def skip_comment(self):
-        self.advance()
-        while self.current_char != '\n':
-            self.advance()
         self.advance()
+        return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
 
 
 # region Nodes
 class NumberNode:
+    __slots__ = ('tok', 'pos_start', 'pos_end')
+
     def __init__(self, tok):
         self.tok = tok
         self.pos_start = self.tok.pos_start
         self.pos_end = self.tok.pos_end
 
+    @property
+    def literal_type(self):
+        return 'int' if self.tok.type == TT_INT else 'float'
+
     def __repr__(self):
         return f'{self.tok}'
 
 
 class StringNode:
+    __slots__ = ('tok', 'pos_start', 'pos_end')
+    literal_type = 'string'
+
     def __init__(self, tok):
         self.tok = tok
         self.pos_start = self.tok.pos_start
@@ -504,6 +507,8 @@ class StringNode:
 
 
 class ArrayNode:
+    __slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
     def __init__(self, element_nodes, pos_start, pos_end):
         self.element_nodes = element_nodes
         self.pos_start = pos_start
@@ -511,6 +516,8 @@ class ArrayNode:
 
 
 class VarAssignNode:
+    __slots__ = ('var_name_tok', 'value_node', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, value_node):
         self.var_name_tok = var_name_tok
         self.value_node = value_node
@@ -519,6 +526,8 @@ class VarAssignNode:
 
 
 class ScopedAssignNode:
+    __slots__ = ('var_name_tok', 'value_node', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, value_node):
         self.var_name_tok = var_name_tok
         self.value_node = value_node
@@ -527,6 +536,8 @@ class ScopedAssignNode:
 
 
 class StrictAssignNode:
+    __slots__ = ('var_name_tok', 'value_node', 'var_type', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, value_node, var_type):
         self.var_name_tok = var_name_tok
         self.value_node = value_node
@@ -536,6 +547,8 @@ class StrictAssignNode:
 
 
 class AccessNode:
+    __slots__ = ('var_name_tok', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok):
         self.var_name_tok = var_name_tok
         self.pos_start = self.var_name_tok.pos_start
@@ -543,6 +556,8 @@ class AccessNode:
 
 
 class BinaryOpNode:
+    __slots__ = ('left_node', 'op_tok', 'right_node', 'pos_start', 'pos_end')
+
     def __init__(self, left_node, op_tok, right_node):
         self.left_node = left_node
         self.op_tok = op_tok
@@ -555,6 +570,8 @@ class BinaryOpNode:
 
 
 class UnaryOpNode:
+    __slots__ = ('op_tok', 'node', 'pos_start', 'pos_end')
+
     def __init__(self, op_tok, node):
         self.op_tok = op_tok
         self.node = node
@@ -566,14 +583,18 @@ class UnaryOpNode:
 
 
 class IfNode:
+    __slots__ = ('cases', 'else_case', 'pos_start', 'pos_end')
+
     def __init__(self, cases, else_case):
         self.cases = cases
         self.else_case = else_case
         self.pos_start = self.cases[0][0].pos_start
-        self.pos_end = (self.else_case or self.cases[len(self.cases) - 1])[0].pos_end
+        self.pos_end = (self.else_case or self.cases[-1])[0].pos_end
 
 
 class ForNode:
+    __slots__ = ('var_name_tok', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null):
         self.var_name_tok = var_name_tok
         self.start_value_node = start_value_node
@@ -587,6 +608,8 @@ class ForNode:
 
 
 class WhileNode:
+    __slots__ = ('condition_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
     def __init__(self, condition_node, body_node, should_return_null):
         self.condition_node = condition_node
         self.body_node = body_node
@@ -597,6 +620,8 @@ class WhileNode:
 
 
 class FuncDefNode:
+    __slots__ = ('var_name_tok', 'arg_name_toks', 'arg_defaults', 'body_node', 'should_auto_return', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, arg_name_toks, arg_defaults, body_node, should_auto_return):
         self.var_name_tok = var_name_tok
         self.arg_name_toks = arg_name_toks
@@ -606,7 +631,7 @@ class FuncDefNode:
 
         if self.var_name_tok:
             self.pos_start = self.var_name_tok.pos_start
-        elif len(self.arg_name_toks) > 0:
+        elif self.arg_name_toks:
             self.pos_start = self.arg_name_toks[0].pos_start
         else:
             self.pos_start = self.body_node.pos_start
@@ -615,19 +640,23 @@ class FuncDefNode:
 
 
 class CallNode:
+    __slots__ = ('node_to_call', 'arg_nodes', 'pos_start', 'pos_end')
+
     def __init__(self, node_to_call, arg_nodes):
         self.node_to_call = node_to_call
         self.arg_nodes = arg_nodes
 
         self.pos_start = self.node_to_call.pos_start
 
-        if len(self.arg_nodes) > 0:
-            self.pos_end = self.arg_nodes[len(self.arg_nodes) - 1].pos_end
+        if self.arg_nodes:
+            self.pos_end = self.arg_nodes[-1].pos_end
         else:
             self.pos_end = self.node_to_call.pos_end
 
 
 class ReturnNode:
+    __slots__ = ('node_to_return', 'pos_start', 'pos_end')
+
     def __init__(self, node_to_return, pos_start, pos_end):
         self.node_to_return = node_to_return
         self.pos_start = pos_start
@@ -635,12 +664,16 @@ class ReturnNode:
 
 
 class ContinueNode:
+    __slots__ = ('pos_start', 'pos_end')
+
     def __init__(self, pos_start, pos_end):
         self.pos_start = pos_start
         self.pos_end = pos_end
 
 
 class BreakNode:
+    __slots__ = ('pos_start', 'pos_end')
+
     def __init__(self, pos_start, pos_end):
         self.pos_start = pos_start
         self.pos_end = pos_end
@@ -650,48 +683,36 @@ class BreakNode:
 
 
 class ParseResult:
+    __slots__ = ('error', 'node')
+
     def __init__(self):
         self.error = None
         self.node = None
-        self.advance_count = 0
-        self.to_reverse_count = 0
-
-    def register(self, res):
-        self.advance_count += res.advance_count
-        if res.error: self.error = res.error
-        return res.node
-
-    def try_register(self, res):
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return None
-        return self.register(res)
-
-    def register_advancement(self):
-        self.advance_count += 1
 
     def success(self, node):
         self.node = node
         return self
 
     def failure(self, error):
-        if not self.error or self.advance_count == 0:
-            self.error = error
+        self.error = error
         return self
 
-    def should_return(self):
-        return self.error
-
 
 class Parser:
+    __slots__ = ('tokens', 'tokens_len', 'tok_idx', 'current_tok')
+
     def __init__(self, tokens):
         self.tokens = tokens
+        self.tokens_len = len(tokens)
         self.tok_idx = -1
         self.advance()
 
     def advance(self):
-        self.tok_idx += 1
-        self.update_current_tok()
+        # Same as update_current_tok, the index can only go past the end here
+        tok_idx = self.tok_idx + 1
+        self.tok_idx = tok_idx
+        if tok_idx < self.tokens_len:
+            self.current_tok = self.tokens[tok_idx]
         return self.current_tok
 
     def reverse(self, amount=1):
@@ -700,862 +721,741 @@ class Parser:
         return self.current_tok
 
     def update_current_tok(self):
-        if self.tok_idx >= 0 and self.tok_idx < len(self.tokens):
+        if 0 <= self.tok_idx < self.tokens_len:
             self.current_tok = self.tokens[self.tok_idx]
 
+    def skip_newlines(self):
+        # Jumps over a whole run of NEWLINE tokens and returns how many there were
+        tokens = self.tokens
+        start_idx = tok_idx = self.tok_idx
+        while tok_idx < self.tokens_len and tokens[tok_idx].type == TT_NEWLINE:
+            tok_idx += 1
+
+        if tok_idx != start_idx:
+            self.tok_idx = tok_idx
+            self.update_current_tok()
+        return tok_idx - start_idx
+
+    def expect(self, tok_type, message):
+        # Consumes a token of the given type, otherwise gives back the error for the rule to return
+        if self.current_tok.type != tok_type:
+            return InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                message
+            )
+        self.advance()
+        return None
+
     def parse(self):
-        res = self.statements()
-        if not res.error and self.current_tok.type != TT_EOF:
+        # Rules return (node, error) tuples, this wraps the result for callers
+        res = ParseResult()
+        node, error = self.statements()
+        if error: return res.failure(error)
+        if self.current_tok.type != TT_EOF:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Token cannot appear after previous tokens"
             ))
-        return res
+        return res.success(node)
 
     def atom(self):
-        res = ParseResult()
         tok = self.current_tok
+        tok_type = tok.type
 
-        if tok.type in (TT_INT, TT_FLOAT):
-            res.register_advancement()
+        if tok_type in (TT_INT, TT_FLOAT):
             self.advance()
-            return res.success(NumberNode(tok))
+            return NumberNode(tok), None
 
-        elif tok.type == TT_STRING:
-            res.register_advancement()
+        elif tok_type == TT_STRING:
             self.advance()
-            return res.success(StringNode(tok))
+            return StringNode(tok), None
 
-        elif tok.type == TT_IDENTIFIER:
-            res.register_advancement()
+        elif tok_type == TT_IDENTIFIER:
             self.advance()
-            return res.success(AccessNode(tok))
+            return AccessNode(tok), None
 
-        elif tok.type == TT_LPAREN:
-            res.register_advancement()
+        elif tok_type == TT_LPAREN:
             self.advance()
-            expression = res.register(self.expression())
-            if res.error: return res
+            expression, error = self.expression()
+            if error: return None, error
             if self.current_tok.type == TT_RPAREN:
-                res.register_advancement()
                 self.advance()
-                return res.success(expression)
+                return expression, None
             else:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected ')'"
-                ))
+                )
 
-        elif tok.type == TT_LSQUARE:
-            list_expr = res.register(self.list_expr())
-            if res.error: return res
-            return res.success(list_expr)
+        elif tok_type == TT_LSQUARE:
+            return self.list_expr()
 
         # elif tok.type == TT_LCURLY:
-        #    list_expr = res.register(self.obj_expr())
-        #    if res.error: return res
-        #    return res.success(list_expr)
-
-        elif tok.matches(TT_KEYWORD, 'if'):
-            if_expr = res.register(self.if_expr())
-            if res.error: return res
-            return res.success(if_expr)
-
-        elif tok.matches(TT_KEYWORD, 'for'):
-            for_expr = res.register(self.for_expr())
-            if res.error: return res
-            return res.success(for_expr)
-
-        elif tok.matches(TT_KEYWORD, 'while'):
-            while_expr = res.register(self.while_expr())
-            if res.error: return res
-            return res.success(while_expr)
-
-        elif tok.matches(TT_KEYWORD, 'function'):
-            func = res.register(self.func_def())
-            if res.error: return res
-            return res.success(func)
-
-        return res.failure(InvalidSyntaxError(
+        #    return self.obj_expr()
+
+        elif tok_type == TT_IF:
+            return self.if_expr()
+
+        elif tok_type == TT_FOR:
+            return self.for_expr()
+
+        elif tok_type == TT_WHILE:
+            return self.while_expr()
+
+        elif tok_type == TT_FUNCTION:
+            return self.func_def()
+
+        return None, InvalidSyntaxError(
             tok.pos_start, tok.pos_end,
             "Expected ')', 'var', 'if', 'function', int, float, identifier, '+', '-', '(', '[', or 'not' "
-        ))
+        )
 
     def func_def(self):
-        res = ParseResult()
-
-        if not self.current_tok.matches(TT_KEYWORD, 'function'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'function'"
-            ))
-
-        res.register_advancement()
-        self.advance()
+        error = self.expect(TT_FUNCTION, "Expected 'function'")
+        if error: return None, error
 
         if self.current_tok.type == TT_IDENTIFIER:
             var_name_tok = self.current_tok
-            res.register_advancement()
             self.advance()
             if self.current_tok.type != TT_LPAREN:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected '('"
-                ))
+                    "Expected '('"
+                )
         else:
             var_name_tok = None
             if self.current_tok.type != TT_LPAREN:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected identifier or '('"
-                ))
+                    "Expected identifier or '('"
+                )
 
-        res.register_advancement()
         self.advance()
         arg_name_toks = []
         arg_defaults = []
 
         if self.current_tok.type == TT_IDENTIFIER:
-            arg_name_toks.append(self.current_tok)
-            res.register_advancement()
-            self.advance()
-
-            if self.current_tok.type == TT_EQ:
-                res.register_advancement()
-                self.advance()
-                arg_defaults.append(self.current_tok)
-                res.register_advancement()
+            seen_default = False
+            while True:
+                arg_name_toks.append(self.current_tok)
                 self.advance()
-                has_made_mandatory_arg = True
 
-            while self.current_tok.type == TT_COMMA:
-                res.register_advancement()
+                if self.current_tok.type == TT_EQ:
+                    self.advance()
+                    arg_defaults.append(self.current_tok)
+                    self.advance()
+                    seen_default = True
+                # Defaults are bound to the trailing parameters, so a required one may not follow them
+                elif seen_default:
+                    return None, InvalidSyntaxError(
+                        arg_name_toks[-1].pos_start, arg_name_toks[-1].pos_end,
+                        "Parameters with default values must come last"
+                    )
+
+                if self.current_tok.type != TT_COMMA:
+                    break
                 self.advance()
 
                 if self.current_tok.type != TT_IDENTIFIER:
-                    return res.failure(InvalidSyntaxError(
+                    return None, InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
-                        f"Expected identifier"
-                    ))
-
-                arg_name_toks.append(self.current_tok)
-                res.register_advancement()
-                self.advance()
-
-            if self.current_tok.type == TT_EQ:
-                res.register_advancement()
-                self.advance()
-                arg_defaults.append(self.current_tok)
-                has_made_mandatory_arg = True
-                res.register_advancement()
-                self.advance()
+                        "Expected identifier"
+                    )
 
             if self.current_tok.type != TT_RPAREN:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected ',' '=' or ')'"
-                ))
+                    "Expected ',' '=' or ')'"
+                )
         else:
             if self.current_tok.type != TT_RPAREN:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected identifier or ')'"
-                ))
+                    "Expected identifier or ')'"
+                )
 
-        res.register_advancement()
         self.advance()
 
         if self.current_tok.type == TT_ARROW:
-            res.register_advancement()
             self.advance()
-            node_to_return = res.register(self.expression())
-            if res.error: return res
+            node_to_return, error = self.expression()
+            if error: return None, error
 
-            return res.success(FuncDefNode(
+            return FuncDefNode(
                 var_name_tok,
                 arg_name_toks,
                 arg_defaults,
                 node_to_return,
                 True
-            ))
-
-        if self.current_tok.type != TT_NEWLINE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '=>' or NEWLINE"
-            ))
-
-        res.register_advancement()
-        self.advance()
+            ), None
 
-        body = res.register(self.statements())
-        if res.error: return res
+        error = self.expect(TT_NEWLINE, "Expected '=>' or NEWLINE")
+        if error: return None, error
 
-        if not self.current_tok.matches(TT_KEYWORD, 'end'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'end'"
-            ))
+        body, error = self.statements()
+        if error: return None, error
 
-        res.register_advancement()
-        self.advance()
+        error = self.expect(TT_END, "Expected 'end'")
+        if error: return None, error
 
-        return res.success(FuncDefNode(
+        return FuncDefNode(
             var_name_tok,
             arg_name_toks,
             arg_defaults,
             body,
             False
-        ))
+        ), None
 
     def call(self):
-        res = ParseResult()
-        atom = res.register(self.atom())
-        if res.error: return res
+        atom, error = self.atom()
+        if error: return None, error
 
         if self.current_tok.type == TT_LPAREN:
-            res.register_advancement()
             self.advance()
             arg_nodes = []
 
             if self.current_tok.type == TT_RPAREN:
-                res.register_advancement()
                 self.advance()
             else:
-                arg_nodes.append(res.register(self.expression()))
-                if res.error:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        "Expected ')', 'var', 'if', 'function', int, float, identifier, '+', '-', '(', '[', or 'not' "
-                    ))
+                arg_node, error = self.expression()
+                if error: return None, error
+                arg_nodes.append(arg_node)
 
                 while self.current_tok.type == TT_COMMA:
-                    res.register_advancement()
                     self.advance()
 
-                    arg_nodes.append(res.register(self.expression()))
-                    if res.error: return res
+                    arg_node, error = self.expression()
+                    if error: return None, error
+                    arg_nodes.append(arg_node)
 
-                if self.current_tok.type != TT_RPAREN:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        f"Expected ',' or ')'"
-                    ))
-
-                res.register_advancement()
-                self.advance()
-            return res.success(CallNode(atom, arg_nodes))
-        return res.success(atom)
+                error = self.expect(TT_RPAREN, "Expected ',' or ')'")
+                if error: return None, error
+            return CallNode(atom, arg_nodes), None
+        return atom, None
 
     def for_expr(self):
-        res = ParseResult()
-
-        if not self.current_tok.matches(TT_KEYWORD, 'for'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'for'"
-            ))
-
-        res.register_advancement()
-        self.advance()
+        error = self.expect(TT_FOR, "Expected 'for'")
+        if error: return None, error
 
         if self.current_tok.type != TT_IDENTIFIER:
-            return res.failure(InvalidSyntaxError(
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected identifier"
-            ))
+                "Expected identifier"
+            )
 
         var_name = self.current_tok
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type != TT_EQ:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '='"
-            ))
+        error = self.expect(TT_EQ, "Expected '='")
+        if error: return None, error
 
-        res.register_advancement()
-        self.advance()
+        start_value, error = self.expression()
+        if error: return None, error
 
-        start_value = res.register(self.expression())
-        if res.error: return res
+        error = self.expect(TT_UNTIL, "Expected 'until'")
+        if error: return None, error
 
-        if not self.current_tok.matches(TT_KEYWORD, 'until'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'until'"
-            ))
-
-        res.register_advancement()
-        self.advance()
+        end_value, error = self.expression()
+        if error: return None, error
 
-        end_value = res.register(self.expression())
-        if res.error: return res
-
-        if self.current_tok.matches(TT_KEYWORD, 'step'):
-            res.register_advancement()
+        if self.current_tok.type == TT_STEP:
             self.advance()
 
-            step_value = res.register(self.expression())
-            if res.error: return res
+            step_value, error = self.expression()
+            if error: return None, error
         else:
             step_value = None
 
-        if not (self.current_tok.matches(TT_KEYWORD, 'then') or self.current_tok.type == 'ARROW'):
-            return res.failure(InvalidSyntaxError(
+        if self.current_tok.type not in (TT_THEN, TT_ARROW):
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'then' or '=>'"
-            ))
+                "Expected 'then' or '=>'"
+            )
 
-        res.register_advancement()
         self.advance()
 
         if self.current_tok.type == TT_NEWLINE:
-            res.register_advancement()
             self.advance()
 
-            body = res.register(self.statements())
-            if res.error: return res
-
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected 'end'"
-                ))
+            body, error = self.statements()
+            if error: return None, error
 
-            res.register_advancement()
-            self.advance()
+            error = self.expect(TT_END, "Expected 'end'")
+            if error: return None, error
 
-            return res.success(ForNode(var_name, start_value, end_value, step_value, body, True))
+            return ForNode(var_name, start_value, end_value, step_value, body, True), None
 
-        body = res.register(self.statement())
-        if res.error: return res
+        body, error = self.statement()
+        if error: return None, error
 
-        return res.success(ForNode(var_name, start_value, end_value, step_value, body, False))
+        return ForNode(var_name, start_value, end_value, step_value, body, False), None
 
     def while_expr(self):
-        res = ParseResult()
+        error = self.expect(TT_WHILE, "Expected 'while'")
+        if error: return None, error
 
-        if not self.current_tok.matches(TT_KEYWORD, 'while'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'while'"
-            ))
-
-        res.register_advancement()
-        self.advance()
+        condition, error = self.expression()
+        if error: return None, error
 
-        condition = res.register(self.expression())
-        if res.error: return res
-
-        if not (self.current_tok.matches(TT_KEYWORD, 'then') or self.current_tok.type == 'ARROW'):
-            return res.failure(InvalidSyntaxError(
+        if self.current_tok.type not in (TT_THEN, TT_ARROW):
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'then' or '=>'"
-            ))
+                "Expected 'then' or '=>'"
+            )
 
-        res.register_advancement()
         self.advance()
 
         if self.current_tok.type == TT_NEWLINE:
-            res.register_advancement()
             self.advance()
 
-            body = res.register(self.statements())
-            if res.error: return res
+            body, error = self.statements()
+            if error: return None, error
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected 'end'"
-                ))
+            error = self.expect(TT_END, "Expected 'end'")
+            if error: return None, error
 
-            res.register_advancement()
-            self.advance()
+            return WhileNode(condition, body, True), None
 
-            return res.success(WhileNode(condition, body, True))
+        body, error = self.statement()
+        if error: return None, error
 
-        body = res.register(self.statement())
-        if res.error: return res
-
-        return res.success(WhileNode(condition, body, False))
+        return WhileNode(condition, body, False), None
 
     def if_expr(self):
-        res = ParseResult()
-        all_cases = res.register(self.if_expr_cases('if'))
-        if res.error: return res
+        all_cases, error = self.if_expr_cases('if')
+        if error: return None, error
         cases, else_case = all_cases
-        return res.success(IfNode(cases, else_case))
+        return IfNode(cases, else_case), None
 
     def if_expr_b(self):
         return self.if_expr_cases('elif')
 
     def if_expr_c(self):
-        res = ParseResult()
         else_case = None
 
-        if self.current_tok.matches(TT_KEYWORD, 'else'):
-            res.register_advancement()
+        if self.current_tok.type == TT_ELSE:
             self.advance()
 
             if self.current_tok.type == TT_NEWLINE:
-                res.register_advancement()
                 self.advance()
 
-                statements = res.register(self.statements())
-                if res.error: return res
+                statements, error = self.statements()
+                if error: return None, error
                 else_case = (statements, True)
 
-                if self.current_tok.matches(TT_KEYWORD, 'end'):
-                    res.register_advancement()
+                if self.current_tok.type == TT_END:
                     self.advance()
                 else:
-                    return res.failure(InvalidSyntaxError(
+                    return None, InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         "Expected 'end'"
-                    ))
+                    )
             else:
-                expr = res.register(self.statement())
-                if res.error: return res
+                expr, error = self.statement()
+                if error: return None, error
                 else_case = (expr, False)
 
-        return res.success(else_case)
+        return else_case, None
 
     def if_expr_b_or_c(self):
-        res = ParseResult()
         cases, else_case = [], None
 
-        if self.current_tok.matches(TT_KEYWORD, 'elif'):
-            all_cases = res.register(self.if_expr_b())
-            if res.error: return res
+        if self.current_tok.type == TT_ELIF:
+            all_cases, error = self.if_expr_b()
+            if error: return None, error
             cases, else_case = all_cases
         else:
-            else_case = res.register(self.if_expr_c())
-            if res.error: return res
+            else_case, error = self.if_expr_c()
+            if error: return None, error
 
-        return res.success((cases, else_case))
+        return (cases, else_case), None
 
     def if_expr_cases(self, case_keyword):
-        res = ParseResult()
         cases = []
         else_case = None
 
-        if not self.current_tok.matches(TT_KEYWORD, case_keyword):
-            return res.failure(InvalidSyntaxError(
+        if self.current_tok.type != KEYWORD_TOKEN_TYPES[case_keyword]:
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 f"Expected '{case_keyword}'"
-            ))
+            )
 
-        res.register_advancement()
         self.advance()
 
-        condition = res.register(self.expression())
-        if res.error: return res
+        condition, error = self.expression()
+        if error: return None, error
 
-        if not (self.current_tok.matches(TT_KEYWORD, 'then') or self.current_tok.type == TT_ARROW):
-            return res.failure(InvalidSyntaxError(
+        if self.current_tok.type not in (TT_THEN, TT_ARROW):
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected 'then' or '=>'"
-            ))
+                "Expected 'then' or '=>'"
+            )
 
-        res.register_advancement()
         self.advance()
 
         if self.current_tok.type == TT_NEWLINE:
-            res.register_advancement()
             self.advance()
 
-            statements = res.register(self.statements())
-            if res.error: return res
+            statements, error = self.statements()
+            if error: return None, error
             cases.append((condition, statements, True))
 
-            if self.current_tok.matches(TT_KEYWORD, 'end'):
-                res.register_advancement()
+            if self.current_tok.type == TT_END:
                 self.advance()
             else:
-                all_cases = res.register(self.if_expr_b_or_c())
-                if res.error: return res
+                all_cases, error = self.if_expr_b_or_c()
+                if error: return None, error
                 new_cases, else_case = all_cases
                 cases.extend(new_cases)
         else:
-            expr = res.register(self.statement())
-            if res.error: return res
+            expr, error = self.statement()
+            if error: return None, error
             cases.append((condition, expr, False))
 
-            all_cases = res.register(self.if_expr_b_or_c())
-            if res.error: return res
+            all_cases, error = self.if_expr_b_or_c()
+            if error: return None, error
             new_cases, else_case = all_cases
             cases.extend(new_cases)
 
-        return res.success((cases, else_case))
+        return (cases, else_case), None
 
+    # power, term and arith_expr run for every operand, so they carry their own copy of the BinaryOp loop
     def power(self):
-        return self.BinaryOp(self.call, (TT_POW,), self.factor)
+        left, error = self.call()
+        if error: return None, error
+
+        while (1 << self.current_tok.type) & POWER_OPS:
+            op_tok = self.current_tok
+            self.advance()
+            right, error = self.factor()
+            if error: return None, error
+            left = BinaryOpNode(left, op_tok, right)
+
+        return left, None
 
     def factor(self):
-        res = ParseResult()
         tok = self.current_tok
 
         if tok.type in (TT_PLUS, TT_MINUS):
-            res.register_advancement()
             self.advance()
-            factor = res.register(self.factor())
-            if res.error: return res
-            return res.success(UnaryOpNode(tok, factor))
+            factor, error = self.factor()
+            if error: return None, error
+            return UnaryOpNode(tok, factor), None
 
         return self.power()
 
     def term(self):
-        return self.BinaryOp(self.factor, (TT_MUL, TT_DIV, TT_MOD))
+        left, error = self.factor()
+        if error: return None, error
+
+        while (1 << self.current_tok.type) & TERM_OPS:
+            op_tok = self.current_tok
+            self.advance()
+            right, error = self.factor()
+            if error: return None, error
+            left = BinaryOpNode(left, op_tok, right)
+
+        return left, None
 
     def arith_expr(self):
-        return self.BinaryOp(self.term, (TT_PLUS, TT_MINUS))
+        left, error = self.term()
+        if error: return None, error
+
+        while (1 << self.current_tok.type) & ARITH_OPS:
+            op_tok = self.current_tok
+            self.advance()
+            right, error = self.term()
+            if error: return None, error
+            left = BinaryOpNode(left, op_tok, right)
+
+        return left, None
 
     def comp_expr(self):
-        res = ParseResult()
-        if self.current_tok.matches(TT_KEYWORD, 'not'):
+        if self.current_tok.type == TT_NOT:
             op_tok = self.current_tok
-            res.register_advancement()
             self.advance()
 
-            node = res.register(self.comp_expr())
-            if res.error: return res
-            return res.success(UnaryOpNode(op_tok, node))
-        node = res.register(self.BinaryOp(self.arith_expr, (TT_EE, TT_NE, TT_LT, TT_GT, TT_LTE, TT_GTE)))
-        if res.error:
-            return res.failure(InvalidSyntaxError(
+            node, error = self.comp_expr()
+            if error: return None, error
+            return UnaryOpNode(op_tok, node), None
+
+        start_idx = self.tok_idx
+        node, error = self.BinaryOp(self.arith_expr, COMP_OPS)
+        if error:
+            # A more specific error from further along the expression is kept
+            if self.tok_idx != start_idx: return None, error
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected var, if, function, Int, Float, Identifier, '+', '-', '(', '[', or 'not'"
-            ))
+            )
 
-        return res.success(node)
+        return node, None
 
     def list_expr(self):
-        res = ParseResult()
         element_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        if self.current_tok.type != TT_LSQUARE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '['"
-            ))
-
-        res.register_advancement()
-        self.advance()
+        error = self.expect(TT_LSQUARE, "Expected '['")
+        if error: return None, error
 
         if self.current_tok.type == TT_RSQUARE:
-            res.register_advancement()
             self.advance()
         else:
-            element_nodes.append(res.register(self.expression()))
-            if res.error:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected ']', 'var', 'if', 'function', int, float, identifier, '+', '-', '(', '[', or 'not' "
-                ))
+            element_node, error = self.expression()
+            if error: return None, error
+            element_nodes.append(element_node)
 
             while self.current_tok.type == TT_COMMA:
-                res.register_advancement()
                 self.advance()
 
-                element_nodes.append(res.register(self.expression()))
-                if res.error: return res
-
-            if self.current_tok.type != TT_RSQUARE:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected ',' or ']'"
-                ))
+                element_node, error = self.expression()
+                if error: return None, error
+                element_nodes.append(element_node)
 
-            res.register_advancement()
-            self.advance()
+            error = self.expect(TT_RSQUARE, "Expected ',' or ']'")
+            if error: return None, error
 
-        return res.success(ArrayNode(
+        return ArrayNode(
             element_nodes,
             pos_start,
-            self.current_tok.pos_end.copy()
-        ))
+            self.current_tok.pos_end
+        ), None
 
     def statements(self):
-        res = ParseResult()
         statements = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        while self.current_tok.type == TT_NEWLINE:
-            res.register_advancement()
-            self.advance()
+        self.skip_newlines()
 
-        statement = res.register(self.statement())
-        if res.error: return res
+        statement, error = self.statement()
+        if error: return None, error
         statements.append(statement)
 
-        more_statements = True
+        while self.skip_newlines():
+            # Anything that cannot start a statement ends the list without trying to parse one
+            if not (1 << self.current_tok.type) & STATEMENT_STARTERS: break
 
-        while True:
-            newline_count = 0
-            while self.current_tok.type == TT_NEWLINE:
-                res.register_advancement()
-                self.advance()
-                newline_count += 1
-            if newline_count == 0:
-                more_statements = False
-
-            if not more_statements: break
-            statement = res.try_register(self.statement())
-            if not statement:
-                self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
+            start_idx = self.tok_idx
+            statement, error = self.statement()
+            if error:
+                self.reverse(self.tok_idx - start_idx)
+                break
             statements.append(statement)
 
-        return res.success(ArrayNode(
+        return ArrayNode(
             statements,
             pos_start,
-            self.current_tok.pos_end.copy()
-        ))
+            self.current_tok.pos_end
+        ), None
 
     def statement(self):
-        res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        if self.current_tok.matches(TT_KEYWORD, 'return'):
-            res.register_advancement()
+        if self.current_tok.type == TT_RETURN:
             self.advance()
 
-            expr = res.try_register(self.expression())
-            if not expr:
-                self.reverse(res.to_reverse_count)
-            return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start.copy()))
+            start_idx = self.tok_idx
+            expr, error = self.expression()
+            if error:
+                self.reverse(self.tok_idx - start_idx)
+            return ReturnNode(expr, pos_start, self.current_tok.pos_start), None
 
-        if self.current_tok.matches(TT_KEYWORD, 'continue'):
-            res.register_advancement()
+        if self.current_tok.type == TT_CONTINUE:
             self.advance()
-            return res.success(ContinueNode(pos_start, self.current_tok.pos_start.copy()))
+            return ContinueNode(pos_start, self.current_tok.pos_start), None
 
-        if self.current_tok.matches(TT_KEYWORD, 'break'):
-            res.register_advancement()
+        if self.current_tok.type == TT_BREAK:
             self.advance()
-            return res.success(BreakNode(pos_start, self.current_tok.pos_start.copy()))
+            return BreakNode(pos_start, self.current_tok.pos_start), None
 
-        expr = res.register(self.expression())
-        if res.error:
-            return res.failure(InvalidSyntaxError(
+        start_idx = self.tok_idx
+        expr, error = self.expression()
+        if error:
+            if self.tok_idx != start_idx: return None, error
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'return', 'continue', 'break', 'var', 'if', 'for', 'while', 'function', int, float, "
                 "identifier, '+', '-', '(', '[' or 'not' "
-            ))
-        return res.success(expr)
+            )
+        return expr, None
 
     def expression(self):
-        res = ParseResult()
         possible_ops = [TT_EQ, TT_PLUS, TT_MINUS, TT_MUL, TT_DIV, TT_MOD, TT_POW]
 
-        if self.current_tok.matches(TT_KEYWORD, 'var') or self.current_tok.matches(TT_KEYWORD, 'let'):
-            res.register_advancement()
+        if self.current_tok.type in (TT_VAR, TT_LET):
             self.advance()
 
             if self.current_tok.type != TT_IDENTIFIER:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected identifier"
-                ))
+                )
 
             var_name = self.current_tok
-            res.register_advancement()
             self.advance()
 
             if self.current_tok.type != TT_EQ:
-                return res.success(VarAssignNode(var_name, Number.null))
+                return VarAssignNode(var_name, Number.null), None
 
-            res.register_advancement()
             self.advance()
-            expr = res.register(self.expression())
-            if res.error: return res
-            return res.success(VarAssignNode(var_name, expr))
+            expr, error = self.expression()
+            if error: return None, error
+            return VarAssignNode(var_name, expr), None
 
-        if self.current_tok.matches(TT_KEYWORD, 'scoped'):
-            res.register_advancement()
+        if self.current_tok.type == TT_SCOPED:
             self.advance()
 
             if self.current_tok.type != TT_IDENTIFIER:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected identifier"
-                ))
+                )
 
             var_name = self.current_tok
-            res.register_advancement()
             self.advance()
 
             if self.current_tok.type != TT_EQ:
-                return res.success(VarAssignNode(var_name, Number.null))
+                return VarAssignNode(var_name, Number.null), None
 
-            res.register_advancement()
             self.advance()
-            expr = res.register(self.expression())
-            if res.error: return res
-            return res.success(ScopedAssignNode(var_name, expr))
+            expr, error = self.expression()
+            if error: return None, error
+            return ScopedAssignNode(var_name, expr), None
 
-        if self.current_tok.matches(TT_KEYWORD, 'strict'):
-            res.register_advancement()
+        if self.current_tok.type == TT_STRICT:
             self.advance()
 
             if self.current_tok.value not in TYPES:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected Type declaration"
-                ))
+                )
             type_ = self.current_tok.value
-            res.register_advancement()
             self.advance()
 
             if self.current_tok.type != TT_IDENTIFIER:
-                return res.failure(InvalidSyntaxError(
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected identifier"
-                ))
+                )
 
             var_name = self.current_tok
-            clean_var_name = str(var_name).replace('IDENTIFIER:', '')
-            if global_symbol_table.isStrict(clean_var_name):
-                if type_ != global_symbol_table.getType(clean_var_name):
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        "Cannot assign 'strict' variable to different type!"
-                    ))
-            res.register_advancement()
             self.advance()
 
-            if self.current_tok.type != TT_EQ:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected '='"
-                ))
+            error = self.expect(TT_EQ, "Expected '='")
+            if error: return None, error
+            expr, error = self.expression()
+            if error: return None, error
 
-            res.register_advancement()
-            self.advance()
-            expr = res.register(self.expression())
-
-            if type_ == "string" and not str(expr).__contains__('STRING'):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected Type 'string'"
-                ))
-
-            if type_ == "int" and not str(expr).__contains__('INT'):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected Type 'int'"
-                ))
-
-            if type_ == "float" and not str(expr).__contains__('FLOAT'):
-                return res.failure(InvalidSyntaxError(
+            # Only literals have a type known while parsing, anything else is accepted
+            literal_type = getattr(expr, 'literal_type', None)
+            if literal_type is not None and literal_type != type_:
+                return None, InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected Type 'float'"
-                ))
+                    f"Expected Type '{type_}'"
+                )
 
-            if res.error: return res
-            return res.success(StrictAssignNode(var_name, expr, type_))
+            return StrictAssignNode(var_name, expr, type_), None
 
-        node = res.register(self.BinaryOp(self.comp_expr, ((TT_KEYWORD, 'and'), (TT_KEYWORD, 'or'))))
+        start_idx = self.tok_idx
+        node, error = self.BinaryOp(self.comp_expr, LOGIC_OPS)
 
-        if res.error:
-            return res.failure(InvalidSyntaxError(
+        if error:
+            if self.tok_idx != start_idx: return None, error
+            return None, InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'var', 'let', 'if', 'for', 'while', 'function', int, float, identifier, '+', '-', '(', '[' or 'not'"
-            ))
+            )
 
-        return res.success(node)
+        return node, None
 
     def BinaryOp(self, func_a, ops, func_b=None):
         if func_b is None:
             func_b = func_a
-        res = ParseResult()
-        left = res.register(func_a())
-        if res.error: return res
+        left, error = func_a()
+        if error: return None, error
 
-        while self.current_tok.type in ops or (self.current_tok.type, self.current_tok.value) in ops:
+        while (1 << self.current_tok.type) & ops:
             op_tok = self.current_tok
-            res.register_advancement()
             self.advance()
-            right = res.register(func_b())
-            if res.error: return res
+            right, error = func_b()
+            if error: return None, error
             left = BinaryOpNode(left, op_tok, right)
 
-        return res.success(left)
+        return left, None
+
+
+# RTResult.flags bits, any of them set means the current visit has to unwind
+RT_ERROR = 1
+RT_RETURN = 2
+RT_CONTINUE = 4
+RT_BREAK = 8
 
 
 class RTResult:
+    __slots__ = ('value', 'error', 'warn', 'func_return_value', 'flags')
+
     def __init__(self):
         self.value = None
         self.error = None
         self.warn = None
         self.func_return_value = None
-        self.loop_should_continue = False
-        self.loop_should_break = False
+        self.flags = 0
         # self.no_return_value = False
-        self.to_reverse_count = 0
-        self.reset()
-
-    def reset(self):
-        self.value = None
-        self.error = None
-        self.func_return_value = None
-        self.loop_should_continue = False
-        self.loop_should_break = False
-        self.to_reverse_count = 0
 
     def register(self, res):
         self.error = res.error
         self.func_return_value = res.func_return_value
-        self.loop_should_continue = res.loop_should_continue
-        self.loop_should_break = res.loop_should_break
+        self.flags = res.flags
         return res.value
 
-    def try_register(self, res):
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return None
-        return self.register(res)
-
+    # Each of these sets every field directly, they run at least once for every node visited
     def success(self, value=None):
-        self.reset()
         self.value = value
+        self.error = None
+        self.func_return_value = None
+        self.flags = 0
         return self
 
     def success_return(self, value):
-        self.reset()
+        self.value = None
+        self.error = None
         self.func_return_value = value
+        self.flags = RT_RETURN
         return self
 
     def success_continue(self):
-        self.reset()
-        self.loop_should_continue = True
+        self.value = None
+        self.error = None
+        self.func_return_value = None
+        self.flags = RT_CONTINUE
         return self
 
     def success_break(self):
-        self.reset()
-        self.loop_should_break = True
+        self.value = None
+        self.error = None
+        self.func_return_value = None
+        self.flags = RT_BREAK
         return self
 
     def failure(self, error):
-        self.reset()
+        self.value = None
         self.error = error
+        self.func_return_value = None
+        self.flags = RT_ERROR
         return self
 
-    def warn(self, warn):
-        self.warn = warn
-
+    # The visitors test res.flags directly, this is kept for anything else holding an RTResult
     def should_return(self):
-        return (
-                self.error or self.func_return_value or self.loop_should_continue or self.loop_should_break
-        )
+        return self.flags
 
 
 # region Data Types
 class Value:
+    __slots__ = ('pos_start', 'pos_end', 'context')
+    # Shown by typeof(), every Value subclass sets its own
+    type_name = None
+
     def __init__(self):
         self.set_pos()
         self.set_context()
@@ -1636,9 +1536,15 @@ class Value:
 
 
 class Number(Value):
+    __slots__ = ('value',)
+    type_name = 'Number'
+
     def __init__(self, value):
-        super().__init__()
+        # Every arithmetic result is a new Number, so skip the set_pos/set_context calls of Value.__init__
         self.value = value
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
 
     def added_to(self, other):
         if isinstance(other, Number):
@@ -1678,7 +1584,7 @@ class Number(Value):
                     'Division by zero',
                     self.context
                 )
-            return Number(self.value - (other.value * floor(self.value / other.value))).set_context(self.context), None
+            return Number(self.value % other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -1690,37 +1596,37 @@ class Number(Value):
 
     def get_comparison_eq(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value == other.value)).set_context(self.context), None
+            return Bool(1 if self.value == other.value else 0).set_context(self.context), None
         else:
             return Bool(0).set_context(self.context), None
 
     def get_comparison_ne(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value != other.value)).set_context(self.context), None
+            return Bool(1 if self.value != other.value else 0).set_context(self.context), None
         else:
             return Bool(1).set_context(self.context), None
 
     def get_comparison_lt(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value < other.value)).set_context(self.context), None
+            return Bool(1 if self.value < other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gt(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value > other.value)).set_context(self.context), None
+            return Bool(1 if self.value > other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_lte(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value <= other.value)).set_context(self.context), None
+            return Bool(1 if self.value <= other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gte(self, other):
         if isinstance(other, Number):
-            return Bool(int(self.value >= other.value)).set_context(self.context), None
+            return Bool(1 if self.value >= other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -1739,10 +1645,12 @@ class Number(Value):
     def notted(self, other=None):
         return Bool(1 if self.value == 0 else 0).set_context(self.context), None
 
+    # Every variable read copies its value, so the immutable types set the copied fields directly
     def copy(self):
         copy = Number(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
+        copy.pos_start = self.pos_start
+        copy.pos_end = self.pos_end
+        copy.context = self.context
         return copy
 
     def is_true(self):
@@ -1766,9 +1674,14 @@ Number.negative_infinity = Number(float('-inf'))
 
 
 class String(Value):
+    __slots__ = ('value',)
+    type_name = 'String'
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
 
     def added_to(self, other):
         if isinstance(other, String):
@@ -1797,13 +1710,13 @@ class String(Value):
 
     def get_comparison_eq(self, other):
         if isinstance(other, String):
-            return Bool(int(self.value == other.value)).set_context(self.context), None
+            return Bool(1 if self.value == other.value else 0).set_context(self.context), None
         else:
             return Bool(0).set_context(self.context), None
 
     def get_comparison_ne(self, other):
         if isinstance(other, String):
-            return Bool(int(self.value != other.value)).set_context(self.context), None
+            return Bool(1 if self.value != other.value else 0).set_context(self.context), None
         else:
             return Bool(1).set_context(self.context), None
 
@@ -1812,8 +1725,9 @@ class String(Value):
 
     def copy(self):
         copy = String(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
+        copy.pos_start = self.pos_start
+        copy.pos_end = self.pos_end
+        copy.context = self.context
         return copy
 
     def display_without_quotes(self):
@@ -1823,10 +1737,7 @@ class String(Value):
         return type(items), items
 
     def __len__(self):
-        count = 0
-        for i in self.value:
-            count += 1
-        return count
+        return len(self.value)
 
     def __str__(self):
         return self.value
@@ -1842,14 +1753,16 @@ String.no_return = String("No Return Value, ignore this!")
 
 
 class Array(Value):
+    __slots__ = ('elements',)
+    type_name = 'Array'
+
     def __init__(self, elements):
         super().__init__()
         self.elements = elements
 
     def added_to(self, other):
-        new_list = self.copy()
-        new_list.elements.append(other)
-        return new_list, None
+        # Building the result list in one go also keeps the original array untouched
+        return Array(self.elements + [other]).set_pos(self.pos_start, self.pos_end).set_context(self.context), None
 
     def subtracted_by(self, other):
         if isinstance(other, Number):
@@ -1868,9 +1781,7 @@ class Array(Value):
 
     def multiplied_by(self, other):
         if isinstance(other, Array):
-            new_list = self.copy()
-            new_list.elements.extend(other.elements)
-            return new_list, None
+            return Array(self.elements + other.elements).set_pos(self.pos_start, self.pos_end).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -1888,7 +1799,7 @@ class Array(Value):
             return None, Value.illegal_operation(self, other)
 
     def copy(self):
-        copy = Array(self.elements)
+        copy = Array(list(self.elements))
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
@@ -1897,35 +1808,41 @@ class Array(Value):
         return ", ".join([str(x) for x in self.elements])
 
     def __repr__(self):
-        return f'[{", ".join([str(x) for x in self.elements])}]'
+        return f'[{self.__str__()}]'
 
 
 class Bool(Value):
+    __slots__ = ('value',)
+    type_name = 'Bool'
+
     def __init__(self, value):
-        super().__init__()
+        # Every comparison makes a new Bool, so the fields are set here rather than through Value.__init__
         self.value = value
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
 
     def get_comparison_eq(self, other):
         if isinstance(other, Bool):
-            return Bool(int(self.value == other.value)).set_context(self.context), None
+            return Bool(1 if self.value == other.value else 0).set_context(self.context), None
         else:
             return Bool(0).set_context(self.context), None
 
     def get_comparison_ne(self, other):
         if isinstance(other, Bool):
-            return Bool(int(self.value != other.value)).set_context(self.context), None
+            return Bool(1 if self.value != other.value else 0).set_context(self.context), None
         else:
             return Bool(1).set_context(self.context), None
 
     def anded_by(self, other):
         if isinstance(other, Bool):
-            return Bool(int(self.value and other.value)).set_context(self.context), None
+            return Bool(1 if self.value and other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def ored_by(self, other):
         if isinstance(other, Bool):
-            return Bool(int(self.value or other.value)).set_context(self.context), None
+            return Bool(1 if self.value or other.value else 0).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -1937,18 +1854,19 @@ class Bool(Value):
 
     def copy(self):
         copy = Bool(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
+        copy.pos_start = self.pos_start
+        copy.pos_end = self.pos_end
+        copy.context = self.context
         return copy
 
     def __repr__(self):
-        if self.value == 1:
-            return str('True')
-        else:
-            return str('False')
+        return 'True' if self.value == 1 else 'False'
 
 
 class BaseFunction(Value):
+    __slots__ = ('name',)
+    type_name = 'Function'
+
     def __init__(self, name):
         super().__init__()
         self.name = name or "<anonymous>"
@@ -1968,49 +1886,39 @@ class BaseFunction(Value):
                 self.context
             ))
 
-        if (len(args) < len(arg_names)) and (len(args) > len(arg_defaults)):
+        required = len(arg_names) - (len(arg_defaults) if arg_defaults else 0)
+        if len(args) < required:
             return res.failure(RTError(
                 self.pos_start, self.pos_end,
-                f"{len(arg_names) - len(args)} too few args passed into {self}",
+                f"{required - len(args)} too few args passed into {self}",
                 self.context
             ))
 
         return res.success(None)
 
     def populate_args(self, arg_names, arg_defaults, args, exec_ctx):
-        if arg_defaults is not None:
-            if len(arg_defaults) != 0:
-                has_defaults = True
-            else:
-                has_defaults = False
-        else:
-            has_defaults = False
-        chosen = arg_defaults if has_defaults else args
-        for i in range(len(chosen)):
-            arg_name = arg_names[i]
-            if (len(args) < i) or (len(args) == 0):
-                if str(arg_defaults[i]).__contains__("INT:"):
-                    fixed = str(arg_defaults[i]).replace("INT:", '')
-                elif str(arg_defaults[i]).__contains__("STRING:"):
-                    fixed = str(arg_defaults[i]).replace("STRING:", '')
-                else:
-                    fixed = str(arg_defaults[i]).replace("FLOAT:", '')
-                arg_value = Number(fixed)
-                arg_value.set_context(exec_ctx)
-            else:
+        # Defaults belong to the last parameters, check_args has made sure the rest were passed
+        first_default = len(arg_names) - (len(arg_defaults) if arg_defaults else 0)
+        symbol_table = exec_ctx.symbol_table
+        for i, arg_name in enumerate(arg_names):
+            if i < len(args):
                 arg_value = args[i]
-                arg_value.set_context(exec_ctx)
-            exec_ctx.symbol_table.set(arg_name, arg_value)
+            else:
+                arg_value = arg_defaults[i - first_default].copy()
+            arg_value.set_context(exec_ctx)
+            symbol_table.set(arg_name, arg_value)
 
     def check_and_populate_args(self, arg_names, arg_defaults, args, exec_ctx):
         res = RTResult()
         res.register(self.check_args(arg_names, arg_defaults, args))
-        if res.should_return(): return res
+        if res.flags: return res
         self.populate_args(arg_names, arg_defaults, args, exec_ctx)
         return res.success(None)
 
 
 class Function(BaseFunction):
+    __slots__ = ('body_node', 'arg_names', 'arg_defaults', 'should_auto_return')
+
     def __init__(self, name, body_node, arg_names, arg_defaults, should_auto_return):
         super().__init__(name)
         self.body_node = body_node
@@ -2020,14 +1928,14 @@ class Function(BaseFunction):
 
     def execute(self, args):
         res = RTResult()
-        interpreter = Interpreter()
+        interpreter = Interpreter.instance
         exec_ctx = self.generate_new_context()
 
         res.register(self.check_and_populate_args(self.arg_names, self.arg_defaults, args, exec_ctx))
-        if res.should_return(): return res
+        if res.flags: return res
 
         value = res.register(interpreter.visit(self.body_node, exec_ctx))
-        if res.should_return() and res.func_return_value is None: return res
+        if res.flags and res.func_return_value is None: return res
 
         ret_value = (value if self.should_auto_return else None) or res.func_return_value or Number.null
         return res.success(ret_value)
@@ -2043,6 +1951,8 @@ class Function(BaseFunction):
 
 
 class BuiltInFunction(BaseFunction):
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -2050,14 +1960,15 @@ class BuiltInFunction(BaseFunction):
         res = RTResult()
         exec_ctx = self.generate_new_context()
 
-        method_name = f'execute_{self.name}'
-        method = getattr(self, method_name, self.no_visit_method)
+        method = BuiltInFunction.execute_methods.get(self.name)
+        if method is None: self.no_visit_method()
 
+        # Every argument is now in exec_ctx's own table, so the execute_ methods read exec_ctx.symbol_table.symbols directly
         res.register(self.check_and_populate_args(method.arg_names, None, args, exec_ctx))
-        if res.should_return(): return res
+        if res.flags: return res
 
-        return_value = res.register(method(exec_ctx))
-        if res.should_return(): return res
+        return_value = res.register(method(self, exec_ctx))
+        if res.flags: return res
         return res.success(return_value)
 
     def no_visit_method(self):
@@ -2073,10 +1984,11 @@ class BuiltInFunction(BaseFunction):
         return f'<built-in ${self.name}>'
 
     def execute_print(self, exec_ctx):
-        if type(exec_ctx.symbol_table.get('value')) is Array:
-            return RTResult().success(String(f"[{str(exec_ctx.symbol_table.get('value'))}]"))
+        value = exec_ctx.symbol_table.symbols['value'].value
+        if type(value) is Array:
+            return RTResult().success(String(f"[{str(value)}]"))
         else:
-            return RTResult().success(String(exec_ctx.symbol_table.get('value')))
+            return RTResult().success(String(value))
 
     execute_print.arg_names = ["value"]
 
@@ -2093,7 +2005,7 @@ class BuiltInFunction(BaseFunction):
                 number = Number(text)
                 break
             else:
-                print(f"Input must be a Number!")
+                print("Input must be a Number!")
         return RTResult().success(number)
 
     execute_input_int.arg_names = []
@@ -2105,52 +2017,37 @@ class BuiltInFunction(BaseFunction):
     execute_clear.arg_names = []
 
     def execute_is_number(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get('value'), Number)
+        is_number = isinstance(exec_ctx.symbol_table.symbols['value'].value, Number)
         return RTResult().success(Number.true if is_number else Number.false)
 
     execute_is_number.arg_names = ['value']
 
     def execute_is_string(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get('value'), String)
+        is_number = isinstance(exec_ctx.symbol_table.symbols['value'].value, String)
         return RTResult().success(Number.true if is_number else Number.false)
 
     execute_is_string.arg_names = ['value']
 
     def execute_is_array(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get('value'), Array)
+        is_number = isinstance(exec_ctx.symbol_table.symbols['value'].value, Array)
         return RTResult().success(Number.true if is_number else Number.false)
 
     execute_is_array.arg_names = ['value']
 
     def execute_is_function(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get('value'), BaseFunction)
+        is_number = isinstance(exec_ctx.symbol_table.symbols['value'].value, BaseFunction)
         return RTResult().success(Number.true if is_number else Number.false)
 
     execute_is_function.arg_names = ['value']
 
     def execute_typeof(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get('value'), Number)
-        is_string = isinstance(exec_ctx.symbol_table.get('value'), String)
-        is_array = isinstance(exec_ctx.symbol_table.get('value'), Array)
-        is_function = isinstance(exec_ctx.symbol_table.get('value'), BaseFunction)
-        is_bool = isinstance(exec_ctx.symbol_table.get('value'), Bool)
-        if is_number:
-            return RTResult().success(String("Number"))
-        elif is_string:
-            return RTResult().success(String("String"))
-        elif is_array:
-            return RTResult().success(String("Array"))
-        elif is_function:
-            return RTResult().success(String("Function"))
-        elif is_bool:
-            return RTResult().success(String("Bool"))
-        else:
-            return RTResult().success(String("That's strange, this value has no type."))
+        type_name = exec_ctx.symbol_table.symbols['value'].value.type_name
+        return RTResult().success(String(type_name or "That's strange, this value has no type."))
 
     execute_typeof.arg_names = ['value']
 
     def execute_len(self, exec_ctx):
-        array_ = exec_ctx.symbol_table.get('array')
+        array_ = exec_ctx.symbol_table.symbols['array'].value
         if isinstance(array_, Array):
             return RTResult().success(Number(len(array_.elements)))
         elif isinstance(array_, String):
@@ -2170,13 +2067,9 @@ class BuiltInFunction(BaseFunction):
     execute_time.arg_names = []
 
     def execute_base64_encode(self, exec_ctx):
-        string_ = exec_ctx.symbol_table.get('string')
+        string_ = exec_ctx.symbol_table.symbols['string'].value
         if isinstance(string_, String):
-            string_converted = str(string_)
-            string_bytes = string_converted.encode('ascii')
-            base64_bytes = base64.b64encode(string_bytes)
-            base64_string = base64_bytes.decode('ascii')
-            return RTResult().success(String(base64_string))
+            return RTResult().success(String(base64.b64encode(string_.value.encode('ascii')).decode('ascii')))
         else:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
@@ -2187,18 +2080,17 @@ class BuiltInFunction(BaseFunction):
     execute_base64_encode.arg_names = ['string']
 
     def execute_base64_decode(self, exec_ctx):
-        string_ = exec_ctx.symbol_table.get('string')
+        string_ = exec_ctx.symbol_table.symbols['string'].value
         if isinstance(string_, String):
-            string_converted = str(string_)
-
-            string_bytes = string_converted.encode('ascii')
-            base64_bytes = base64.b64encode(string_bytes)
-            base64_string = base64_bytes.decode('ascii')
-
-            string_bytes_decode = base64_string.encode('ascii')
-            base64_bytes_decode = base64.b64decode(string_bytes_decode)
-            base64_string_decode = base64_bytes_decode.decode('ascii')
-            return RTResult().success(String(base64_string_decode))
+            try:
+                decoded = base64.b64decode(string_.value.encode('ascii'), validate=True).decode('ascii')
+            except ValueError:
+                return RTResult().failure(RTError(
+                    self.pos_start, self.pos_end,
+                    "Argument must be a Base64 encoded string",
+                    exec_ctx
+                ))
+            return RTResult().success(String(decoded))
         else:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
@@ -2209,7 +2101,7 @@ class BuiltInFunction(BaseFunction):
     execute_base64_decode.arg_names = ['string']
 
     def execute_number_to_unicode(self, exec_ctx):
-        number_ = exec_ctx.symbol_table.get('number')
+        number_ = exec_ctx.symbol_table.symbols['number'].value
         if isinstance(number_, Number):
             if int(number_) > 1111998:
                 return RTResult().failure(RTError(
@@ -2229,7 +2121,7 @@ class BuiltInFunction(BaseFunction):
     execute_number_to_unicode.arg_names = ['number']
 
     def execute_unicode_to_number(self, exec_ctx):
-        string_ = exec_ctx.symbol_table.get('string')
+        string_ = exec_ctx.symbol_table.symbols['string'].value
         if isinstance(string_, String):
             if len(str(string_)) > 1:
                 return RTResult().failure(RTError(
@@ -2249,7 +2141,7 @@ class BuiltInFunction(BaseFunction):
     execute_unicode_to_number.arg_names = ['string']
 
     def execute_format_number(self, exec_ctx):
-        number = exec_ctx.symbol_table.get('num')
+        number = exec_ctx.symbol_table.symbols['num'].value
         if isinstance(number, Number):
             exponent = math.floor(math.log(float(number), 10))
             mantissa = float(number) / (math.pow(10, exponent))
@@ -2264,27 +2156,33 @@ class BuiltInFunction(BaseFunction):
 
     execute_format_number.arg_names = ['num']
 
-    def execute_run(self, exec_ctx):
-        fn = exec_ctx.symbol_table.get('fn')
+    def load_script(self, exec_ctx):
+        # Shared by run, use and read, gives the file name and its text, or the failed result to return
+        fn = exec_ctx.symbol_table.symbols['fn'].value
         if not isinstance(fn, String):
-            return RTResult().failure(RTError(
+            return None, None, RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be a string",
                 exec_ctx
             ))
         fn = fn.value
-        if fn != re.search(".peanut$", fn):
+        if not fn.endswith(".peanut"):
             fn += ".peanut"
 
         try:
             with open(fn, 'r') as f:
                 script = f.read()
         except Exception as e:
-            return RTResult().failure(RTError(
+            return None, None, RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Failed to load script \"{fn}\"\n" + str(e),
                 exec_ctx
             ))
+        return fn, script, None
+
+    def execute_run(self, exec_ctx):
+        fn, script, failed = self.load_script(exec_ctx)
+        if failed: return failed
 
         _, error = run(fn, script)
         if error:
@@ -2298,26 +2196,8 @@ class BuiltInFunction(BaseFunction):
     execute_run.arg_names = ['fn']
 
     def execute_use(self, exec_ctx):
-        fn = exec_ctx.symbol_table.get('fn')
-        if not isinstance(fn, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
-                "Argument must be a string",
-                exec_ctx
-            ))
-        fn = fn.value
-        if fn != re.search(".peanut$", fn):
-            fn += ".peanut"
-
-        try:
-            with open(fn, 'r') as f:
-                script = f.read()
-        except Exception as e:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
-                f"Failed to load script \"{fn}\"\n" + str(e),
-                exec_ctx
-            ))
+        fn, script, failed = self.load_script(exec_ctx)
+        if failed: return failed
 
         _, error = run(fn, script)
         if error:
@@ -2331,26 +2211,8 @@ class BuiltInFunction(BaseFunction):
     execute_use.arg_names = ['fn']
 
     def execute_read(self, exec_ctx):
-        fn = exec_ctx.symbol_table.get('fn')
-        if not isinstance(fn, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
-                "Argument must be a string",
-                exec_ctx
-            ))
-        fn = fn.value
-        if fn != re.search(".peanut$", fn):
-            fn += ".peanut"
-
-        try:
-            with open(fn, 'r') as f:
-                script = f.read()
-        except Exception as e:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
-                f"Failed to load script \"{fn}\"\n" + str(e),
-                exec_ctx
-            ))
+        fn, script, failed = self.load_script(exec_ctx)
+        if failed: return failed
 
         return RTResult().success(String(script))
 
@@ -2361,6 +2223,11 @@ class BuiltInFunction(BaseFunction):
 
 
 # region BuiltIn Funcs
+# Same as Interpreter.visit_methods, execute() looks these up by name on every call
+BuiltInFunction.execute_methods = {
+    name[len('execute_'):]: method
+    for name, method in vars(BuiltInFunction).items() if name.startswith('execute_')
+}
 BuiltInFunction.print = BuiltInFunction("print")
 BuiltInFunction.print_return = BuiltInFunction("print_return")
 BuiltInFunction.input = BuiltInFunction("input")
@@ -2389,6 +2256,8 @@ BuiltInFunction.read = BuiltInFunction("read")
 # endregion
 
 class Context:
+    __slots__ = ('display_name', 'parent', 'parent_entry_pos', 'symbol_table')
+
     def __init__(self, display_name, parent=None, parent_entry_pos=None):
         self.display_name = display_name
         self.parent = parent
@@ -2396,61 +2265,76 @@ class Context:
         self.symbol_table = None
 
 
+# Everything set() stores for a name, kept together so one lookup finds all of it
+class Symbol(namedtuple('Symbol', ('value', 'is_var', 'is_scoped', 'is_strict', 'type_'))):
+    __slots__ = ()
+
+
 class SymbolTable:
+    # Variable reads walk symbols and parent once per table up the chain
+    __slots__ = ('symbols', 'parent')
+
     def __init__(self, parent=None):
         self.symbols = {}
-        self.symbols_should_scope = {}
-        self.symbols_are_vars = {}
-        self.symbols_are_strict_vars = {}
-        self.var_types = {}
         self.parent = parent
 
+    def lookup(self, name):
+        table = self
+        while table is not None:
+            symbol = table.symbols.get(name)
+            if symbol is not None: return symbol
+            table = table.parent
+        return None
+
     def get(self, name):
-        value = self.symbols.get(name, None)
-        if value is None and self.parent:
-            return self.parent.get(name)
-        return value
+        symbol = self.lookup(name)
+        return symbol.value if symbol else None
 
     def getScope(self, name):
-        should_scope = self.symbols_should_scope.get(name, None)
-        if should_scope is None and self.parent:
-            return self.parent.get(name)
-        return should_scope
+        symbol = self.lookup(name)
+        return symbol.is_scoped if symbol else None
 
     def isStrict(self, name):
-        strict_typed = self.symbols_are_strict_vars.get(name, None)
-        if strict_typed is None and self.parent:
-            return self.parent.get(name)
-        return strict_typed
+        symbol = self.lookup(name)
+        return symbol.is_strict if symbol else None
 
     def varCheck(self, name):
-        is_var = self.symbols_are_vars.get(name, None)
-        if is_var is None and self.parent:
-            return self.parent.get(name)
-        return is_var
+        symbol = self.lookup(name)
+        return symbol.is_var if symbol else None
 
     def getType(self, name):
-        type_ = self.var_types.get(name, None)
-        if type_ is None and self.parent:
-            return self.parent.get(name)
-        return type_
+        symbol = self.lookup(name)
+        return symbol.type_ if symbol else None
 
     def set(self, name, value, is_var=False, is_scoped=False, is_strict=False, type_=None):
-        self.symbols[name] = value
-        self.symbols_should_scope[name] = is_scoped
-        self.symbols_are_vars[name] = is_var
-        self.symbols_are_strict_vars[name] = is_strict
-        self.var_types[name] = type_
+        self.symbols[name] = Symbol(value, is_var, is_scoped, is_strict, type_)
 
     def remove(self, name):
         del self.symbols[name]
 
 
+# The Value method visit_BinaryOpNode calls for each operator token type
+BINARY_OP_METHODS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subtracted_by',
+    TT_MUL: 'multiplied_by',
+    TT_DIV: 'divided_by',
+    TT_POW: 'pow',
+    TT_MOD: 'modded_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NE: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_GT: 'get_comparison_gt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GTE: 'get_comparison_gte',
+    TT_AND: 'anded_by',
+    TT_OR: 'ored_by',
+}
+
+
 class Interpreter:
     def visit(self, node, context):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        return Interpreter.visit_methods.get(type(node), Interpreter.no_visit_method)(self, node, context)
 
     def no_visit_method(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method defined')
@@ -2471,7 +2355,7 @@ class Interpreter:
 
         for element_node in node.element_nodes:
             elements.append(res.register(self.visit(element_node, context)))
-            if res.should_return(): return res
+            if res.flags: return res
 
         return res.success(
             Array(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
@@ -2484,7 +2368,7 @@ class Interpreter:
             value = res.register(self.visit(node.value_node, context))
         else:
             value = Number.null
-        if res.should_return(): return res
+        if res.flags: return res
 
         global_symbol_table.set(var_name, value, True, False, False)
         return res.success(value)
@@ -2496,7 +2380,7 @@ class Interpreter:
             value = res.register(self.visit(node.value_node, context))
         else:
             value = Number.null
-        if res.should_return(): return res
+        if res.flags: return res
 
         if context.parent is None:
             locked_symbol_table.set(var_name, value, True, True, False)
@@ -2509,8 +2393,16 @@ class Interpreter:
         res = RTResult()
         var_name = node.var_name_tok.value
         type_ = node.var_type
+        # Checked here rather than while parsing, parsed scripts are cached and the table changes between runs
+        symbol = global_symbol_table.lookup(var_name)
+        if symbol and symbol.is_strict and symbol.type_ != type_:
+            return res.failure(RTError(
+                node.var_name_tok.pos_start, node.var_name_tok.pos_end,
+                "Cannot assign 'strict' variable to different type!",
+                context
+            ))
         value = res.register(self.visit(node.value_node, context))
-        if res.should_return(): return res
+        if res.flags: return res
 
         global_symbol_table.set(var_name, value, True, False, True, type_)
         return res.success(value)
@@ -2518,14 +2410,14 @@ class Interpreter:
     def visit_AccessNode(self, node, context):
         res = RTResult()
         var_name = node.var_name_tok.value
-        value = context.symbol_table.get(var_name)
-        should_scope = context.symbol_table.getScope(var_name)
-
+        # The global context only reads from the locked table, and the scope is only needed when nothing was found
         if context.parent is None:
             value = locked_symbol_table.get(var_name)
+        else:
+            value = context.symbol_table.get(var_name)
 
         if not value:
-            if should_scope is False:
+            if context.symbol_table.getScope(var_name) is False:
                 value = global_symbol_table.get(var_name)
             else:
                 return res.failure(RTError(
@@ -2540,38 +2432,11 @@ class Interpreter:
     def visit_BinaryOpNode(self, node, context):
         res = RTResult()
         left = res.register(self.visit(node.left_node, context))
-        if res.should_return(): return res
+        if res.flags: return res
         right = res.register(self.visit(node.right_node, context))
-        if res.should_return(): return res
-
-        if node.op_tok.type == TT_PLUS:
-            result, error = left.added_to(right)
-        elif node.op_tok.type == TT_MINUS:
-            result, error = left.subtracted_by(right)
-        elif node.op_tok.type == TT_MUL:
-            result, error = left.multiplied_by(right)
-        elif node.op_tok.type == TT_DIV:
-            result, error = left.divided_by(right)
-        elif node.op_tok.type == TT_POW:
-            result, error = left.pow(right)
-        elif node.op_tok.type == TT_MOD:
-            result, error = left.modded_by(right)
-        elif node.op_tok.type == TT_EE:
-            result, error = left.get_comparison_eq(right)
-        elif node.op_tok.type == TT_NE:
-            result, error = left.get_comparison_ne(right)
-        elif node.op_tok.type == TT_LT:
-            result, error = left.get_comparison_lt(right)
-        elif node.op_tok.type == TT_GT:
-            result, error = left.get_comparison_gt(right)
-        elif node.op_tok.type == TT_LTE:
-            result, error = left.get_comparison_lte(right)
-        elif node.op_tok.type == TT_GTE:
-            result, error = left.get_comparison_gte(right)
-        elif node.op_tok.matches(TT_KEYWORD, 'and'):
-            result, error = left.anded_by(right)
-        elif node.op_tok.matches(TT_KEYWORD, 'or'):
-            result, error = left.ored_by(right)
+        if res.flags: return res
+
+        result, error = getattr(left, BINARY_OP_METHODS[node.op_tok.type])(right)
         if error:
             return res.failure(error)
         else:
@@ -2580,13 +2445,13 @@ class Interpreter:
     def visit_UnaryOpNode(self, node, context):
         res = RTResult()
         number = res.register(self.visit(node.node, context))
-        if res.should_return(): return res
+        if res.flags: return res
 
         error = None
 
         if node.op_tok.type == TT_MINUS:
             number, error = number.multiplied_by(Number(-1))
-        elif node.op_tok.matches(TT_KEYWORD, 'not'):
+        elif node.op_tok.type == TT_NOT:
             number, error = number.notted()
 
         if error:
@@ -2599,17 +2464,17 @@ class Interpreter:
 
         for condition, expression, should_return_null in node.cases:
             condition_value = res.register(self.visit(condition, context))
-            if res.should_return(): return res
+            if res.flags: return res
 
             if condition_value.is_true():
                 expr_value = res.register(self.visit(expression, context))
-                if res.should_return(): return res
+                if res.flags: return res
                 return res.success(String.no_return if should_return_null else expr_value)
 
         if node.else_case:
             expression, should_return_null = node.else_case
             else_value = res.register(self.visit(expression, context))
-            if res.should_return(): return res
+            if res.flags: return res
             return res.success(String.no_return if should_return_null else else_value)
 
         return res.success(String.no_return)
@@ -2619,37 +2484,40 @@ class Interpreter:
         elements = []
 
         start_value = res.register(self.visit(node.start_value_node, context))
-        if res.should_return(): return res
+        if res.flags: return res
 
         end_value = res.register(self.visit(node.end_value_node, context))
-        if res.should_return(): return res
+        if res.flags: return res
 
         if node.step_value_node:
             step_value = res.register(self.visit(node.step_value_node, context))
-            if res.should_return(): return res
+            if res.flags: return res
         else:
             step_value = Number(1)
 
         i = start_value.value
+        end = end_value.value
+        step = step_value.value
+        ascending = step >= 0
+        var_name = node.var_name_tok.value
+        symbol_table = context.symbol_table
+        body_node = node.body_node
+        # Loops used as statements throw their values away, so there is nothing to collect
+        collect = not node.should_return_null
 
-        if step_value.value >= 0:
-            condition = lambda: i < end_value.value
-        else:
-            condition = lambda: i > end_value.value
-
-        while condition():
-            context.symbol_table.set(node.var_name_tok.value, Number(i))
-            i += step_value.value
+        while (i < end) if ascending else (i > end):
+            symbol_table.set(var_name, Number(i))
+            i += step
 
-            value = res.register(self.visit(node.body_node, context))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
+            value = res.register(self.visit(body_node, context))
+            if res.flags & (RT_ERROR | RT_RETURN): return res
 
-            if res.loop_should_continue:
+            if res.flags & RT_CONTINUE:
                 continue
-            if res.loop_should_break:
+            if res.flags & RT_BREAK:
                 break
 
-            elements.append(value)
+            if collect: elements.append(value)
 
         return res.success(
             String.no_return if node.should_return_null else
@@ -2659,23 +2527,27 @@ class Interpreter:
     def visit_WhileNode(self, node, context):
         res = RTResult()
         elements = []
+        condition_node = node.condition_node
+        body_node = node.body_node
+        # Same as visit_ForNode, values of loops used as statements are never collected
+        collect = not node.should_return_null
 
         while True:
-            condition = res.register(self.visit(node.condition_node, context))
-            if res.should_return(): return res
+            condition = res.register(self.visit(condition_node, context))
+            if res.flags: return res
 
             if not condition.is_true(): break
 
-            value = res.register(self.visit(node.body_node, context))
+            value = res.register(self.visit(body_node, context))
 
-            if res.should_return() and res.loop_should_continue is False and res.loop_should_break is False: return res
+            if res.flags & (RT_ERROR | RT_RETURN): return res
 
-            if res.loop_should_continue:
+            if res.flags & RT_CONTINUE:
                 continue
-            if res.loop_should_break:
+            if res.flags & RT_BREAK:
                 break
 
-            elements.append(value)
+            if collect: elements.append(value)
 
         return res.success(
             String.no_return if node.should_return_null else
@@ -2688,7 +2560,11 @@ class Interpreter:
         func_name = node.var_name_tok.value if node.var_name_tok else None
         body_node = node.body_node
         arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-        arg_defaults = [arg_default for arg_default in node.arg_defaults]
+        # Defaults are literal tokens, so they become values once here rather than on every call
+        arg_defaults = [
+            (String if tok.type == TT_STRING else Number)(tok.value).set_pos(tok.pos_start, tok.pos_end)
+            for tok in node.arg_defaults
+        ]
         func_value = Function(func_name, body_node, arg_names, arg_defaults, node.should_auto_return).set_context(
             context).set_pos(
             node.pos_start, node.pos_end)
@@ -2703,15 +2579,15 @@ class Interpreter:
         args = []
 
         value_to_call = res.register(self.visit(node.node_to_call, context))
-        if res.should_return(): return res
+        if res.flags: return res
         value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
 
         for arg_node in node.arg_nodes:
             args.append(res.register(self.visit(arg_node, context)))
-            if res.should_return(): return res
+            if res.flags: return res
 
         return_value = res.register(value_to_call.execute(args))
-        if res.should_return(): return res
+        if res.flags: return res
         return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
         return res.success(return_value)
 
@@ -2720,7 +2596,7 @@ class Interpreter:
 
         if node.node_to_return:
             value = res.register(self.visit(node.node_to_return, context))
-            if res.should_return(): return res
+            if res.flags: return res
         else:
             value = String.no_return
 
@@ -2733,77 +2609,97 @@ class Interpreter:
         return RTResult().success_break()
 
 
+# Every node goes through visit(), so the visit_ methods are keyed by node class once here
+Interpreter.visit_methods = {
+    globals()[name[len('visit_'):]]: method
+    for name, method in vars(Interpreter).items() if name.startswith('visit_')
+}
+# The interpreter keeps no state of its own, so function calls all share this one
+Interpreter.instance = Interpreter()
+
+
 # region BuiltIns
 locked_symbol_table = SymbolTable()
 global_symbol_table = SymbolTable()
-global_symbol_table.set("NO_RETURN", String.no_return)
-global_symbol_table.set("ZERO", Number.null)
-global_symbol_table.set("FALSE_VALUE", Number.false)
-global_symbol_table.set("TRUE_VALUE", Number.true)
-global_symbol_table.set("false", Number.false)
-global_symbol_table.set("true", Number.true)
-global_symbol_table.set("INFINITY", Number.infinity)
-global_symbol_table.set("NEGATIVE_INF", Number.negative_infinity)
-# region Functions
-global_symbol_table.set("print", BuiltInFunction.print)
-global_symbol_table.set("printReturn", BuiltInFunction.print_return)
-global_symbol_table.set("input", BuiltInFunction.input)
-global_symbol_table.set("inputNumber", BuiltInFunction.input_int)
-global_symbol_table.set("cls", BuiltInFunction.clear)
-global_symbol_table.set("isNumber", BuiltInFunction.is_number)
-global_symbol_table.set("isString", BuiltInFunction.is_string)
-global_symbol_table.set("isArray", BuiltInFunction.is_array)
-global_symbol_table.set("isFunction", BuiltInFunction.is_function)
-global_symbol_table.set("typeof", BuiltInFunction.typeof)
-global_symbol_table.set("append", BuiltInFunction.append)
-global_symbol_table.set("removeIndex", BuiltInFunction.remove)
-global_symbol_table.set("concat", BuiltInFunction.concat)
-global_symbol_table.set("length", BuiltInFunction.len)
-global_symbol_table.set("time", BuiltInFunction.time)
-global_symbol_table.set("b64Encode", BuiltInFunction.base64_encode)
-global_symbol_table.set("b64Decode", BuiltInFunction.base64_decode)
-global_symbol_table.set("toUnicode", BuiltInFunction.number_to_unicode)
-global_symbol_table.set("fromUnicode", BuiltInFunction.unicode_to_number)
-global_symbol_table.set("formatNumber", BuiltInFunction.format_number)
-global_symbol_table.set("run", BuiltInFunction.run)
-global_symbol_table.set("use", BuiltInFunction.use)
-global_symbol_table.set("read", BuiltInFunction.read)
+# None of the builtins are var, scoped or strict, so they all go into the table in one update
+global_symbol_table.symbols.update({
+    name: Symbol(value, False, False, False, None) for name, value in {
+        "NO_RETURN": String.no_return,
+        "ZERO": Number.null,
+        "FALSE_VALUE": Number.false,
+        "TRUE_VALUE": Number.true,
+        "false": Number.false,
+        "true": Number.true,
+        "INFINITY": Number.infinity,
+        "NEGATIVE_INF": Number.negative_infinity,
+        # region Functions
+        "print": BuiltInFunction.print,
+        "printReturn": BuiltInFunction.print_return,
+        "input": BuiltInFunction.input,
+        "inputNumber": BuiltInFunction.input_int,
+        "cls": BuiltInFunction.clear,
+        "isNumber": BuiltInFunction.is_number,
+        "isString": BuiltInFunction.is_string,
+        "isArray": BuiltInFunction.is_array,
+        "isFunction": BuiltInFunction.is_function,
+        "typeof": BuiltInFunction.typeof,
+        "append": BuiltInFunction.append,
+        "removeIndex": BuiltInFunction.remove,
+        "concat": BuiltInFunction.concat,
+        "length": BuiltInFunction.len,
+        "time": BuiltInFunction.time,
+        "b64Encode": BuiltInFunction.base64_encode,
+        "b64Decode": BuiltInFunction.base64_decode,
+        "toUnicode": BuiltInFunction.number_to_unicode,
+        "fromUnicode": BuiltInFunction.unicode_to_number,
+        "formatNumber": BuiltInFunction.format_number,
+        "run": BuiltInFunction.run,
+        "use": BuiltInFunction.use,
+        "read": BuiltInFunction.read,
+    }.items()
+})
 
 
 # endregion
 # endregion
 
 
-def run(fn, text):
+# Scripts run more than once (the run builtin, repeated interpolations) skip lexing and parsing after the first time
+@functools.lru_cache(maxsize=256)
+def parse_script(fn, text):
     lexer = Lexer(fn, text)
     tokens, error = lexer.make_tokens()
     if error: return None, error
 
     parser = Parser(tokens)
     ast = parser.parse()
-    if ast.error: return None, ast.error
+    return ast.node, ast.error
+
 
-    interpreter = Interpreter()
-    context = Context('BASE_LEVEL_SCRIPT')
-    context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
+def parse(fn, text):
+    # Lexing runs interpolations, so source containing one is parsed fresh to pick up current values
+    if '${' in text:
+        return parse_script.__wrapped__(fn, text)
+    return parse_script(fn, text)
+
+
+# run() and run_interpolation() both evaluate at the top level against the global symbol table
+base_context = Context('BASE_LEVEL_SCRIPT')
+base_context.symbol_table = global_symbol_table
+
+
+def run(fn, text):
+    node, error = parse(fn, text)
+    if error: return None, error
+
+    result = Interpreter.instance.visit(node, base_context)
 
     FILE_NAME = fn
     return result.value, result.error
 
 
 def run_interpolation(fn, text):
-    lexer = Lexer(fn, text)
-    tokens, error = lexer.make_tokens()
+    node, error = parse(fn, text)
     if error: return None, error
 
-    parser = Parser(tokens)
-    ast = parser.parse()
-    if ast.error: return None, ast.error
-
-    interpreter = Interpreter()
-    context = Context('BASE_LEVEL_SCRIPT')
-    context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
-
-    return result.value
+    return Interpreter.instance.visit(node, base_context).value
@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Dist'))
+import peanut
+
+
+def run(text):
+    result, error = peanut.run('<test>', text)
+    return result.elements[-1] if result else None, error
+
+
+class FunctionArgsTest(unittest.TestCase):
+    def test_too_few_args_counts_only_required(self):
+        for source, call in (('function f(x, y=2) => x + y', 'f()'), ('function f3(a,b,c=1) => a', 'f3(1)')):
+            _, error = run(source + '\n' + call)
+            self.assertIsInstance(error, peanut.RTError)
+            self.assertTrue(error.details.startswith('1 too few args'), error.details)
+
+    def test_default_binds_to_its_own_parameter(self):
+        result, error = run('function g(a, b=5) => a + b\ng(1)')
+        self.assertIsNone(error)
+        self.assertEqual(result.value, 6)
+
+    def test_default_before_required_parameter_is_rejected(self):
+        for source in ('function f(a=1, b) => b', 'function h(a=1,b,c=3) => b'):
+            _, error = run(source)
+            self.assertIsInstance(error, peanut.InvalidSyntaxError)
+
+    def test_all_parameters_with_defaults(self):
+        for call, expected in (('f()', 3), ('f(5)', 7)):
+            result, error = run('function f(a=1, b=2) => a + b\n' + call)
+            self.assertIsNone(error)
+            self.assertEqual(result.value, expected)
+
+    def test_several_trailing_defaults(self):
+        result, error = run('function g3(a, b=1, c=2) => a + b * c\ng3(4, 3)')
+        self.assertIsNone(error)
+        self.assertEqual(result.value, 10)
+
+
+class Base64Test(unittest.TestCase):
+    def test_decode_round_trip(self):
+        result, error = run('b64Decode(b64Encode("hi"))')
+        self.assertIsNone(error)
+        self.assertEqual(result.value, 'hi')
+
+    def test_decode_rejects_invalid_input(self):
+        for text in ('!!!', 'aGk=!!'):
+            _, error = run(f'b64Decode("{text}")')
+            self.assertIsInstance(error, peanut.RTError)
+            self.assertEqual(error.details, 'Argument must be a Base64 encoded string')
+
+
+class StrictAssignTest(unittest.TestCase):
+    # Each test uses its own name, the global symbol table is shared between runs
+    def assert_strict_error(self, error):
+        self.assertIsInstance(error, peanut.RTError)
+        self.assertEqual(error.details, "Cannot assign 'strict' variable to different type!")
+
+    def test_repeated_source_sees_current_table(self):
+        _, error = run('strict int strict_a = 1')
+        self.assertIsNone(error)
+        _, error = run('strict string strict_a = "s"')
+        self.assert_strict_error(error)
+        run('var strict_a = 0')
+        result, error = run('strict string strict_a = "s"')
+        self.assertIsNone(error)
+        self.assertEqual(result.value, 's')
+        _, error = run('strict int strict_a = 1')
+        self.assert_strict_error(error)
+
+    def test_retyping_within_one_script(self):
+        _, error = run('strict int strict_b = 1\nstrict string strict_b = "s"')
+        self.assert_strict_error(error)
+
+    def test_repeated_interpolation_sees_current_table(self):
+        self.assertEqual(peanut.run_interpolation('<test>', 'strict int strict_c = 1').elements[-1].value, 1)
+        run('var strict_c = 0\nstrict string strict_c = "s"')
+        self.assertIsNone(peanut.run_interpolation('<test>', 'strict int strict_c = 1'))
+        run('var strict_c = 0')
+        self.assertEqual(peanut.run_interpolation('<test>', 'strict int strict_c = 1').elements[-1].value, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()